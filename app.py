@@ -48,7 +48,7 @@ sensor_lock = threading.Lock()
 
 # WiFi
 wifi_process = None
-wifi_queue = queue.Queue()
+wifi_queue = queue.Queue(maxsize=1024)
 wifi_lock = threading.Lock()
 
 # Bluetooth
@@ -183,13 +183,15 @@ def export_wifi() -> Response:
     import io
 
     format_type = request.args.get('format', 'json').lower()
+    networks = wifi_networks
+    clients = wifi_clients
 
     if format_type == 'csv':
         output = io.StringIO()
         writer = csv.writer(output)
         writer.writerow(['bssid', 'ssid', 'channel', 'signal', 'encryption', 'clients'])
 
-        for bssid, net in wifi_networks.items():
+        for bssid, net in networks.items():
             writer.writerow([
                 bssid,
                 net.get('ssid', ''),
@@ -205,8 +207,8 @@ def export_wifi() -> Response:
     else:
         return jsonify({
             'timestamp': __import__('datetime').datetime.utcnow().isoformat(),
-            'networks': list(wifi_networks.values()),
-            'clients': list(wifi_clients.values())
+            'networks': list(networks.values()),
+            'clients': list(clients.values())
         })
 
 
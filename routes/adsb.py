@@ -17,7 +17,7 @@ from flask import Blueprint, jsonify, request, Response, render_template
 import app as app_module
 from utils.logging import adsb_logger as logger
 from utils.validation import validate_device_index, validate_gain
-from utils.sse import format_sse
+from utils.sse import format_sse, SSE_KEEPALIVE
 
 adsb_bp = Blueprint('adsb', __name__, url_prefix='/adsb')
 
@@ -312,7 +312,7 @@ def stream_adsb():
             except queue.Empty:
                 now = time.time()
                 if now - last_keepalive >= keepalive_interval:
-                    yield format_sse({'type': 'keepalive'})
+                    yield SSE_KEEPALIVE
                     last_keepalive = now
 
     response = Response(generate(), mimetype='text/event-stream')
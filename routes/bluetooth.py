@@ -20,7 +20,7 @@ from flask import Blueprint, jsonify, request, Response
 import app as app_module
 from utils.dependencies import check_tool
 from utils.logging import bluetooth_logger as logger
-from utils.sse import format_sse
+from utils.sse import format_sse, SSE_KEEPALIVE
 from data.oui import OUI_DATABASE, load_oui_database, get_manufacturer
 from data.patterns import AIRTAG_PREFIXES, TILE_PREFIXES, SAMSUNG_TRACKER
 
@@ -482,7 +482,7 @@ def stream_bt():
             except queue.Empty:
                 now = time.time()
                 if now - last_keepalive >= keepalive_interval:
-                    yield format_sse({'type': 'keepalive'})
+                    yield SSE_KEEPALIVE
                     last_keepalive = now
 
     response = Response(generate(), mimetype='text/event-stream')
@@ -22,7 +22,7 @@ from flask import Blueprint, jsonify, request, Response
 import app as app_module
 from utils.logging import iridium_logger as logger
 from utils.validation import validate_frequency, validate_device_index, validate_gain
-from utils.sse import format_sse
+from utils.sse import format_sse, SSE_KEEPALIVE
 
 iridium_bp = Blueprint('iridium', __name__, url_prefix='/iridium')
 
@@ -171,7 +171,7 @@ def stream_iridium():
             except queue.Empty:
                 now = time.time()
                 if now - last_keepalive >= keepalive_interval:
-                    yield format_sse({'type': 'keepalive'})
+                    yield SSE_KEEPALIVE
                     last_keepalive = now
 
     response = Response(generate(), mimetype='text/event-stream')
@@ -19,7 +19,7 @@ from flask import Blueprint, jsonify, request, Response
 import app as app_module
 from utils.logging import pager_logger as logger
 from utils.validation import validate_frequency, validate_device_index, validate_gain, validate_ppm
-from utils.sse import format_sse
+from utils.sse import format_sse, SSE_KEEPALIVE
 from utils.process import safe_terminate, register_process
 
 pager_bp = Blueprint('pager', __name__)
@@ -361,7 +361,7 @@ def toggle_logging() -> Response:
 def stream() -> Response:
     import json
 
-    def generate() -> Generator[str, None, None]:
+    def generate() -> Generator[bytes, None, None]:
         last_keepalive = time.time()
         keepalive_interval = 30.0  # Send keepalive every 30 seconds instead of 1 second
 
@@ -373,7 +373,7 @@ def stream() -> Response:
             except queue.Empty:
                 now = time.time()
                 if now - last_keepalive >= keepalive_interval:
-                    yield format_sse({'type': 'keepalive'})
+                    yield SSE_KEEPALIVE
                     last_keepalive = now
 
     response = Response(generate(), mimetype='text/event-stream')
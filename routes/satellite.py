@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import gzip
 import json
+import re
+import threading
+import time
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
 from urllib.parse import urlparse
 
@@ -14,16 +20,292 @@ from data.satellites import TLE_SATELLITES
 from utils.logging import satellite_logger as logger
 from utils.validation import validate_latitude, validate_longitude, validate_hours, validate_elevation
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from skyfield.api import load, EarthSatellite
+    _TS = load.timescale()
+except ImportError:
+    _TS = None
+
 satellite_bp = Blueprint('satellite', __name__, url_prefix='/satellite')
 
 # Maximum response size for external requests (1MB)
 MAX_RESPONSE_SIZE = 1024 * 1024
 
+# Maximum decompressed size of a CelesTrak TLE group (8MB). The largest
+# group, starlink, is around 1.5MB of TLE text and still growing.
+MAX_TLE_RESPONSE_SIZE = 8 * 1024 * 1024
+
 # Allowed hosts for TLE fetching
 ALLOWED_TLE_HOSTS = ['celestrak.org', 'celestrak.com', 'www.celestrak.org', 'www.celestrak.com']
 
+# NORAD catalog numbers of the built-in satellites
+NORAD_TO_NAME = {
+    25544: 'ISS',
+    25338: 'NOAA-15',
+    28654: 'NOAA-18',
+    33591: 'NOAA-19',
+    43013: 'NOAA-20',
+    40069: 'METEOR-M2',
+    57166: 'METEOR-M2-3'
+}
+NAME_TO_NORAD = {v: k for k, v in NORAD_TO_NAME.items()}
+
+# Display colors for pass predictions
+SATELLITE_COLORS = {
+    'ISS': '#00ffff',
+    'NOAA-15': '#00ff00',
+    'NOAA-18': '#ff6600',
+    'NOAA-19': '#ff3366',
+    'NOAA-20': '#00ffaa',
+    'METEOR-M2': '#9370DB',
+    'METEOR-M2-3': '#ff00ff'
+}
+
+# CelesTrak groups refreshed by /update-tle
+TLE_UPDATE_GROUPS = ['stations', 'weather']
+
 # Local TLE cache (can be updated via API)
 _tle_cache = dict(TLE_SATELLITES)
+_tle_lock = threading.Lock()
+
+# Satellite objects built from _tle_cache, so SGP4 setup happens once per TLE
+_sat_cache: dict[str, Any] = {}
+
+# Parsed /celestrak/<category> responses: category -> (expiry timestamp, satellites)
+CELESTRAK_CACHE_TTL = 3600
+_celestrak_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+_celestrak_lock = threading.Lock()
+
+# TLE line 1 prefix and catalog number, matched on raw response bytes
+_TLE_LINE1_RE = re.compile(rb'1 ([ \d]{4}\d)')
+
+
+def _json_response(payload: dict[str, Any]) -> Response:
+    """Build a JSON response, using orjson for large payloads when it is installed."""
+    if orjson is not None:
+        try:
+            return Response(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS), mimetype='application/json')
+        except TypeError:
+            # e.g. integers wider than 64 bits; let jsonify handle them
+            pass
+    return jsonify(payload)
+
+
+def _parse_tle_block(lines: list[bytes]) -> list[tuple[str, int, str, str]]:
+    """
+    Parse three-line TLE records.
+
+    Lines stay as bytes while scanning; only valid records are decoded.
+
+    Args:
+        lines: Raw byte lines from a CelesTrak TLE response
+
+    Returns:
+        List of (name, norad_id, line1, line2) tuples
+    """
+    records = []
+    append = records.append
+    match_line1 = _TLE_LINE1_RE.match
+    n = len(lines)
+
+    i = 0
+    while i + 2 < n:
+        m = match_line1(lines[i + 1])
+        line2 = lines[i + 2]
+
+        if m is None or not line2.startswith(b'2 '):
+            i += 1
+            continue
+
+        try:
+            # The pattern also admits embedded spaces, as in '1 2 345U'
+            norad_id = int(m.group(1))
+        except ValueError:
+            i += 3
+            continue
+
+        append((
+            lines[i].strip().decode('utf-8', 'replace'),
+            norad_id,
+            lines[i + 1].rstrip().decode('ascii', 'replace'),
+            line2.rstrip().decode('ascii', 'replace'),
+        ))
+        i += 3
+
+    return records
+
+
+def _build_satellite(name: str, line1: str, line2: str) -> Any | None:
+    """Build a skyfield EarthSatellite, returning None if the TLE is unusable."""
+    if _TS is None:
+        return None
+    try:
+        return EarthSatellite(line1, line2, name, _TS)
+    except Exception as e:
+        logger.warning(f"Invalid TLE for {name}: {e}")
+        return None
+
+
+def _load_sat_cache() -> None:
+    """Build satellite objects for every entry in the TLE cache."""
+    for key, (name, line1, line2) in _tle_cache.items():
+        satellite = _build_satellite(name, line1, line2)
+        if satellite is not None:
+            _sat_cache[key] = satellite
+
+
+_load_sat_cache()
+
+
+def _propagate_batch(satellites: list[Any], t: Any, observer: Any) -> dict[str, Any]:
+    """
+    Propagate several satellites to a single time in one SGP4 call.
+
+    Args:
+        satellites: EarthSatellite objects from _sat_cache
+        t: skyfield Time (scalar)
+        observer: wgs84 GeographicPosition for alt/az
+
+    Returns:
+        Dict of per-satellite NumPy arrays plus an 'ok' mask of SGP4 successes
+    """
+    import numpy as np
+    from sgp4.api import SatrecArray, jday
+    from skyfield.api import wgs84
+    from skyfield.constants import AU_KM
+    from skyfield.functions import mxv, to_spherical
+    from skyfield.positionlib import Geocentric
+    from skyfield.sgp4lib import TEME
+
+    dt = t.utc_datetime()
+    jd, fr = jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
+
+    errors, r_teme, _ = SatrecArray([sat.model for sat in satellites]).sgp4(np.array([jd]), np.array([fr]))
+
+    # (N, 1, 3) TEME km -> (3, N) GCRS au, as EarthSatellite.at() does per satellite
+    r_gcrs = mxv(TEME.rotation_at(t).T, r_teme[:, 0, :].T / AU_KM)
+    geocentric = Geocentric(r_gcrs, t=t)
+    subpoint = wgs84.subpoint(geocentric)
+
+    topocentric = r_gcrs - observer.at(t).xyz.au[:, None]
+    distance, alt, az = to_spherical(mxv(observer.rotation_at(t), topocentric))
+
+    return {
+        'ok': errors[:, 0] == 0,
+        'lat': subpoint.latitude.degrees,
+        'lon': subpoint.longitude.degrees,
+        'geo_km': geocentric.distance().km,
+        'el': np.degrees(alt),
+        'az': np.degrees(az),
+        'range_km': distance * AU_KM,
+    }
+
+
+def _propagate_tracks(satellites: list[Any], t: Any, offsets_minutes: Any) -> dict[str, Any]:
+    """
+    Compute ground tracks for several satellites in one SGP4 call.
+
+    Args:
+        satellites: EarthSatellite objects from _sat_cache
+        t: skyfield Time the offsets are relative to
+        offsets_minutes: 1-D array of track offsets in minutes
+
+    Returns:
+        Dict of (N, M) NumPy arrays: 'ok' mask of SGP4 successes, 'lat', 'lon'
+    """
+    import numpy as np
+    from sgp4.api import SatrecArray, jday
+    from skyfield.api import wgs84
+    from skyfield.constants import AU_KM
+    from skyfield.functions import mxv
+    from skyfield.positionlib import Geocentric
+    from skyfield.sgp4lib import TEME
+
+    offsets_days = np.asarray(offsets_minutes, dtype=float) / 1440.0
+    dt = t.utc_datetime()
+    jd, fr = jday(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second + dt.microsecond / 1e6)
+
+    errors, r_teme, _ = SatrecArray([sat.model for sat in satellites]).sgp4(
+        np.full(offsets_days.shape, jd), fr + offsets_days
+    )
+
+    # (N, M, 3) TEME km -> (3, N, M) GCRS au, rotated per sample time
+    times = _TS.tt_jd(t.tt + offsets_days)
+    rotation = np.swapaxes(TEME.rotation_at(times), 0, 1)
+    r_gcrs = mxv(rotation, np.moveaxis(r_teme, -1, 0) / AU_KM)
+    subpoint = wgs84.subpoint(Geocentric(r_gcrs, t=times))
+
+    return {
+        'ok': errors == 0,
+        'lat': subpoint.latitude.degrees,
+        'lon': subpoint.longitude.degrees,
+    }
+
+
+def _pair_rise_set(events: Any) -> list[tuple[int, int]]:
+    """
+    Pair each rise event with the next set event.
+
+    Args:
+        events: Boolean flags, True for a rise and False for a set
+
+    Returns:
+        List of (rise index, set index) pairs; a rise without a later set is dropped
+    """
+    import numpy as np
+
+    events = np.asarray(events, dtype=bool)
+    rises = np.flatnonzero(events)
+    sets = np.flatnonzero(~events)
+
+    next_set = np.searchsorted(sets, rises, side='right')
+    has_set = next_set < len(sets)
+    rises, next_set = rises[has_set], next_set[has_set]
+
+    # Only the first rise before a given set starts a pass
+    next_set, first = np.unique(next_set, return_index=True)
+
+    return list(zip(rises[first].tolist(), sets[next_set].tolist()))
+
+
+def _download_tle(group: str) -> bytes:
+    """
+    Download a CelesTrak TLE group as raw bytes.
+
+    The request advertises gzip, which shrinks TLE text several times over.
+    A compressed body is decompressed as it streams in, and the decoded TLE
+    text is capped at MAX_TLE_RESPONSE_SIZE either way.
+    """
+    req = urllib.request.Request(
+        f'https://celestrak.org/NORAD/elements/gp.php?GROUP={group}&FORMAT=tle',
+        headers={'Accept-Encoding': 'gzip'}
+    )
+    with urllib.request.urlopen(req, timeout=10) as response:
+        if response.headers.get('Content-Encoding', '') == 'gzip':
+            with gzip.GzipFile(fileobj=response) as stream:
+                body = stream.read(MAX_TLE_RESPONSE_SIZE + 1)
+        else:
+            body = response.read(MAX_TLE_RESPONSE_SIZE + 1)
+
+    if len(body) > MAX_TLE_RESPONSE_SIZE:
+        raise ValueError(f'CelesTrak response for {group} exceeds {MAX_TLE_RESPONSE_SIZE} bytes')
+
+    return body
+
+
+def _fetch_tle_group(group: str) -> list[tuple[str, int, str, str]]:
+    """Fetch and parse a CelesTrak TLE group, returning no records on failure."""
+    try:
+        content = _download_tle(group)
+        return _parse_tle_block(content.splitlines())
+    except Exception as e:
+        logger.error(f"Error fetching {group}: {e}")
+        return []
 
 
 @satellite_bp.route('/dashboard')
@@ -32,12 +314,120 @@ def satellite_dashboard():
     return render_template('satellite_dashboard.html')
 
 
+@lru_cache(maxsize=1024)
+def _compute_passes(
+    sat_key: tuple[tuple[str, tuple[str, str, str]], ...],
+    lat: float,
+    lon: float,
+    hours: int,
+    min_el: float,
+    minute_bucket: int
+) -> list[dict[str, Any]]:
+    """
+    Predict passes for the given satellites, memoized per minute.
+
+    Args:
+        sat_key: (name, TLE) pairs of the satellites to predict
+        lat: Observer latitude
+        lon: Observer longitude
+        hours: Prediction window in hours
+        min_el: Minimum peak elevation in degrees
+        minute_bucket: Current minute, so cached results expire as it rolls over
+
+    Returns:
+        Passes sorted by start time, without currentPos since that must not
+        be cached; callers must not mutate the result
+    """
+    import numpy as np
+    from skyfield.api import wgs84
+
+    passes = []
+
+    ts = _TS
+    observer = wgs84.latlon(lat, lon)
+
+    t0 = ts.now()
+    t1 = ts.utc(t0.utc_datetime() + timedelta(hours=hours))
+
+    for sat_name, _ in sat_key:
+        satellite = _sat_cache.get(sat_name)
+        if satellite is None:
+            continue
+
+        diff = satellite - observer
+
+        # Horizon rise/culmination/set search runs inside skyfield
+        try:
+            times, events = satellite.find_events(observer, t0, t1, altitude_degrees=0.0)
+        except Exception:
+            continue
+
+        if len(times) == 0:
+            continue
+
+        event_alt, _, _ = diff.at(times).altaz()
+        event_alt = event_alt.degrees
+        horizon_idx = np.flatnonzero(events != 1)
+
+        for rise_pos, set_pos in _pair_rise_set(events[horizon_idx] == 0):
+            rise_idx = horizon_idx[rise_pos]
+            set_idx = horizon_idx[set_pos]
+
+            # Culminations between rise and set give the pass peak, so
+            # passes below min_el are dropped before sampling them
+            max_elevation = max(0.0, float(event_alt[rise_idx:set_idx + 1].max()))
+            if max_elevation < min_el:
+                continue
+
+            rise_time = times[rise_idx]
+            set_time = times[set_idx]
+
+            num_points = 30
+
+            # Sample the pass in Julian days rather than via datetime round-trips
+            rise_jd = rise_time.tt
+            span_jd = set_time.tt - rise_jd
+            duration_seconds = span_jd * 86400.0
+
+            t_points = ts.tt_jd(rise_jd + span_jd * np.linspace(0, 1, num_points))
+            alt, az, _ = diff.at(t_points).altaz()
+
+            trajectory = [
+                {'el': float(max(0, el)), 'az': float(azimuth)}
+                for el, azimuth in zip(alt.degrees, az.degrees)
+            ]
+
+            duration_minutes = int(duration_seconds / 60)
+
+            t_track = ts.tt_jd(rise_jd + span_jd * np.linspace(0, 1, 60))
+            subpoint = wgs84.subpoint(satellite.at(t_track))
+            ground_track = [
+                {'lat': float(sp_lat), 'lon': float(sp_lon)}
+                for sp_lat, sp_lon in zip(subpoint.latitude.degrees, subpoint.longitude.degrees)
+            ]
+
+            passes.append({
+                'satellite': sat_name,
+                'norad': NAME_TO_NORAD.get(sat_name, 0),
+                'startTime': rise_time.utc_datetime().strftime('%Y-%m-%d %H:%M UTC'),
+                'startTimeISO': rise_time.utc_datetime().isoformat(),
+                'maxEl': float(round(max_elevation, 1)),
+                'duration': int(duration_minutes),
+                'trajectory': trajectory,
+                'groundTrack': ground_track,
+                'color': SATELLITE_COLORS.get(sat_name, '#00ff00')
+            })
+
+    passes.sort(key=lambda p: p['startTime'])
+
+    return passes
+
+
 @satellite_bp.route('/predict', methods=['POST'])
 def predict_passes():
     """Calculate satellite passes using skyfield."""
     try:
-        from skyfield.api import load, wgs84, EarthSatellite
-        from skyfield.almanac import find_discrete
+        from skyfield.api import wgs84
     except ImportError:
         return jsonify({
             'status': 'error',
@@ -55,140 +445,37 @@ def predict_passes():
     except ValueError as e:
         return jsonify({'status': 'error', 'message': str(e)}), 400
 
-    norad_to_name = {
-        25544: 'ISS',
-        25338: 'NOAA-15',
-        28654: 'NOAA-18',
-        33591: 'NOAA-19',
-        43013: 'NOAA-20',
-        40069: 'METEOR-M2',
-        57166: 'METEOR-M2-3'
-    }
-
     sat_input = data.get('satellites', ['ISS', 'NOAA-15', 'NOAA-18', 'NOAA-19'])
     satellites = []
     for sat in sat_input:
-        if isinstance(sat, int) and sat in norad_to_name:
-            satellites.append(norad_to_name[sat])
+        if isinstance(sat, int) and sat in NORAD_TO_NAME:
+            satellites.append(NORAD_TO_NAME[sat])
         else:
             satellites.append(sat)
 
-    passes = []
-    colors = {
-        'ISS': '#00ffff',
-        'NOAA-15': '#00ff00',
-        'NOAA-18': '#ff6600',
-        'NOAA-19': '#ff3366',
-        'NOAA-20': '#00ffaa',
-        'METEOR-M2': '#9370DB',
-        'METEOR-M2-3': '#ff00ff'
-    }
-    name_to_norad = {v: k for k, v in norad_to_name.items()}
-
-    ts = load.timescale()
-    observer = wgs84.latlon(lat, lon)
-
-    t0 = ts.now()
-    t1 = ts.utc(t0.utc_datetime() + timedelta(hours=hours))
-
-    for sat_name in satellites:
-        if sat_name not in _tle_cache:
-            continue
-
-        tle_data = _tle_cache[sat_name]
-        try:
-            satellite = EarthSatellite(tle_data[1], tle_data[2], tle_data[0], ts)
-        except Exception:
-            continue
-
-        def above_horizon(t):
-            diff = satellite - observer
-            topocentric = diff.at(t)
-            alt, _, _ = topocentric.altaz()
-            return alt.degrees > 0
-
-        above_horizon.step_days = 1/720
-
-        try:
-            times, events = find_discrete(t0, t1, above_horizon)
-        except Exception:
+    # Key on the TLE lines too, so an /update-tle invalidates cached results
+    sat_key = tuple(
+        (name, _tle_cache[name]) for name in satellites
+        if isinstance(name, str) and name in _sat_cache
+    )
+    passes = _compute_passes(sat_key, lat, lon, hours, min_el, int(time.time() // 60))
+
+    # Live positions change by kilometres per second, so they are computed
+    # per request and merged into copies of the cached passes
+    now = _TS.now()
+    current_pos = {}
+    for sat_name, _ in sat_key:
+        satellite = _sat_cache.get(sat_name)
+        if satellite is None:
             continue
+        subpoint = wgs84.subpoint(satellite.at(now))
+        current_pos[sat_name] = {
+            'lat': float(subpoint.latitude.degrees),
+            'lon': float(subpoint.longitude.degrees)
+        }
+    passes = [{**p, 'currentPos': current_pos.get(p['satellite'])} for p in passes]
 
-        i = 0
-        while i < len(times):
-            if i < len(events) and events[i]:
-                rise_time = times[i]
-                set_time = None
-                for j in range(i + 1, len(times)):
-                    if not events[j]:
-                        set_time = times[j]
-                        i = j
-                        break
-
-                if set_time is None:
-                    i += 1
-                    continue
-
-                trajectory = []
-                max_elevation = 0
-                num_points = 30
-
-                duration_seconds = (set_time.utc_datetime() - rise_time.utc_datetime()).total_seconds()
-
-                for k in range(num_points):
-                    frac = k / (num_points - 1)
-                    t_point = ts.utc(rise_time.utc_datetime() + timedelta(seconds=duration_seconds * frac))
-
-                    diff = satellite - observer
-                    topocentric = diff.at(t_point)
-                    alt, az, _ = topocentric.altaz()
-
-                    el = alt.degrees
-                    azimuth = az.degrees
-
-                    if el > max_elevation:
-                        max_elevation = el
-
-                    trajectory.append({'el': float(max(0, el)), 'az': float(azimuth)})
-
-                if max_elevation >= min_el:
-                    duration_minutes = int(duration_seconds / 60)
-
-                    ground_track = []
-                    for k in range(60):
-                        frac = k / 59
-                        t_point = ts.utc(rise_time.utc_datetime() + timedelta(seconds=duration_seconds * frac))
-                        geocentric = satellite.at(t_point)
-                        subpoint = wgs84.subpoint(geocentric)
-                        ground_track.append({
-                            'lat': float(subpoint.latitude.degrees),
-                            'lon': float(subpoint.longitude.degrees)
-                        })
-
-                    current_geo = satellite.at(ts.now())
-                    current_subpoint = wgs84.subpoint(current_geo)
-
-                    passes.append({
-                        'satellite': sat_name,
-                        'norad': name_to_norad.get(sat_name, 0),
-                        'startTime': rise_time.utc_datetime().strftime('%Y-%m-%d %H:%M UTC'),
-                        'startTimeISO': rise_time.utc_datetime().isoformat(),
-                        'maxEl': float(round(max_elevation, 1)),
-                        'duration': int(duration_minutes),
-                        'trajectory': trajectory,
-                        'groundTrack': ground_track,
-                        'currentPos': {
-                            'lat': float(current_subpoint.latitude.degrees),
-                            'lon': float(current_subpoint.longitude.degrees)
-                        },
-                        'color': colors.get(sat_name, '#00ff00')
-                    })
-
-            i += 1
-
-    passes.sort(key=lambda p: p['startTime'])
-
-    return jsonify({
+    return _json_response({
         'status': 'success',
         'passes': passes
     })
@@ -198,7 +485,7 @@ def predict_passes():
 def get_satellite_position():
     """Get real-time positions of satellites."""
     try:
-        from skyfield.api import load, wgs84, EarthSatellite
+        from skyfield.api import wgs84
     except ImportError:
         return jsonify({'status': 'error', 'message': 'skyfield not installed'}), 503
 
@@ -214,78 +501,72 @@ def get_satellite_position():
     sat_input = data.get('satellites', [])
     include_track = bool(data.get('includeTrack', True))
 
-    norad_to_name = {
-        25544: 'ISS',
-        25338: 'NOAA-15',
-        28654: 'NOAA-18',
-        33591: 'NOAA-19',
-        43013: 'NOAA-20',
-        40069: 'METEOR-M2',
-        57166: 'METEOR-M2-3'
-    }
-
     satellites = []
     for sat in sat_input:
-        if isinstance(sat, int) and sat in norad_to_name:
-            satellites.append(norad_to_name[sat])
+        if isinstance(sat, int) and sat in NORAD_TO_NAME:
+            satellites.append(NORAD_TO_NAME[sat])
         else:
             satellites.append(sat)
 
-    ts = load.timescale()
+    ts = _TS
     observer = wgs84.latlon(lat, lon)
     now = ts.now()
-    now_dt = now.utc_datetime()
 
     positions = []
 
-    for sat_name in satellites:
-        if sat_name not in _tle_cache:
-            continue
+    found = [(name, _sat_cache[name]) for name in satellites if name in _sat_cache]
+    if not found:
+        return _json_response({
+            'status': 'success',
+            'positions': positions,
+            'timestamp': datetime.utcnow().isoformat()
+        })
 
-        tle_data = _tle_cache[sat_name]
-        try:
-            satellite = EarthSatellite(tle_data[1], tle_data[2], tle_data[0], ts)
+    track_offsets = range(-45, 46, 1)
 
-            geocentric = satellite.at(now)
-            subpoint = wgs84.subpoint(geocentric)
+    try:
+        batch = _propagate_batch([sat for _, sat in found], now, observer)
+        if include_track:
+            tracks = _propagate_tracks([sat for _, sat in found], now, list(track_offsets))
+    except Exception as e:
+        logger.error(f"Error propagating satellites: {e}")
+        return jsonify({'status': 'error', 'message': str(e)})
 
-            diff = satellite - observer
-            topocentric = diff.at(now)
-            alt, az, distance = topocentric.altaz()
+    for idx, (sat_name, _) in enumerate(found):
+        if not batch['ok'][idx]:
+            continue
 
+        try:
             pos_data = {
                 'satellite': sat_name,
-                'lat': float(subpoint.latitude.degrees),
-                'lon': float(subpoint.longitude.degrees),
-                'altitude': float(geocentric.distance().km - 6371),
-                'elevation': float(alt.degrees),
-                'azimuth': float(az.degrees),
-                'distance': float(distance.km),
-                'visible': bool(alt.degrees > 0)
+                'lat': float(batch['lat'][idx]),
+                'lon': float(batch['lon'][idx]),
+                'altitude': float(batch['geo_km'][idx] - 6371),
+                'elevation': float(batch['el'][idx]),
+                'azimuth': float(batch['az'][idx]),
+                'distance': float(batch['range_km'][idx]),
+                'visible': bool(batch['el'][idx] > 0)
             }
 
             if include_track:
-                orbit_track = []
-                for minutes_offset in range(-45, 46, 1):
-                    t_point = ts.utc(now_dt + timedelta(minutes=minutes_offset))
-                    try:
-                        geo = satellite.at(t_point)
-                        sp = wgs84.subpoint(geo)
-                        orbit_track.append({
-                            'lat': float(sp.latitude.degrees),
-                            'lon': float(sp.longitude.degrees),
-                            'past': minutes_offset < 0
-                        })
-                    except Exception:
-                        continue
-
-                pos_data['track'] = orbit_track
+                track_ok = tracks['ok'][idx]
+                track_lat = tracks['lat'][idx]
+                track_lon = tracks['lon'][idx]
+                pos_data['track'] = [
+                    {
+                        'lat': float(track_lat[k]),
+                        'lon': float(track_lon[k]),
+                        'past': minutes_offset < 0
+                    }
+                    for k, minutes_offset in enumerate(track_offsets)
+                    if track_ok[k]
+                ]
 
             positions.append(pos_data)
         except Exception:
             continue
 
-    return jsonify({
+    return _json_response({
         'status': 'success',
         'positions': positions,
         'timestamp': datetime.utcnow().isoformat()
@@ -309,33 +590,20 @@ def update_tle():
 
         updated = []
 
-        for group in ['stations', 'weather']:
-            url = f'https://celestrak.org/NORAD/elements/gp.php?GROUP={group}&FORMAT=tle'
-            try:
-                with urllib.request.urlopen(url, timeout=10) as response:
-                    content = response.read().decode('utf-8')
-                    lines = content.strip().split('\n')
-
-                    i = 0
-                    while i + 2 < len(lines):
-                        name = lines[i].strip()
-                        line1 = lines[i + 1].strip()
-                        line2 = lines[i + 2].strip()
-
-                        if not (line1.startswith('1 ') and line2.startswith('2 ')):
-                            i += 1
-                            continue
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(_fetch_tle_group, TLE_UPDATE_GROUPS))
 
-                        internal_name = name_mappings.get(name, name)
+        with _tle_lock:
+            for records in results:
+                for name, _, line1, line2 in records:
+                    internal_name = name_mappings.get(name, name)
 
-                        if internal_name in _tle_cache:
-                            _tle_cache[internal_name] = (name, line1, line2)
-                            updated.append(internal_name)
-
-                        i += 3
-            except Exception as e:
-                logger.error(f"Error fetching {group}: {e}")
-                continue
+                    if internal_name in _tle_cache:
+                        _tle_cache[internal_name] = (name, line1, line2)
+                        satellite = _build_satellite(name, line1, line2)
+                        if satellite is not None:
+                            _sat_cache[internal_name] = satellite
+                        updated.append(internal_name)
 
         return jsonify({
             'status': 'success',
@@ -359,38 +627,27 @@ def fetch_celestrak(category):
     if category not in valid_categories:
         return jsonify({'status': 'error', 'message': f'Invalid category. Valid: {valid_categories}'})
 
-    try:
-        url = f'https://celestrak.org/NORAD/elements/gp.php?GROUP={category}&FORMAT=tle'
-        with urllib.request.urlopen(url, timeout=10) as response:
-            content = response.read().decode('utf-8')
-
-        satellites = []
-        lines = content.strip().split('\n')
-
-        i = 0
-        while i + 2 < len(lines):
-            name = lines[i].strip()
-            line1 = lines[i + 1].strip()
-            line2 = lines[i + 2].strip()
+    with _celestrak_lock:
+        entry = _celestrak_cache.get(category)
+    if entry and entry[0] > time.time():
+        return _json_response({
+            'status': 'success',
+            'category': category,
+            'satellites': entry[1]
+        })
 
-            if not (line1.startswith('1 ') and line2.startswith('2 ')):
-                i += 1
-                continue
+    try:
+        content = _download_tle(category)
 
-            try:
-                norad_id = int(line1[2:7])
-                satellites.append({
-                    'name': name,
-                    'norad': norad_id,
-                    'tle1': line1,
-                    'tle2': line2
-                })
-            except (ValueError, IndexError):
-                pass
+        satellites = [
+            {'name': name, 'norad': norad_id, 'tle1': line1, 'tle2': line2}
+            for name, norad_id, line1, line2 in _parse_tle_block(content.splitlines())
+        ]
 
-            i += 3
+        with _celestrak_lock:
+            _celestrak_cache[category] = (time.time() + CELESTRAK_CACHE_TTL, satellites)
 
-        return jsonify({
+        return _json_response({
             'status': 'success',
             'category': category,
             'satellites': satellites
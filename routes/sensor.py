@@ -15,7 +15,7 @@ from flask import Blueprint, jsonify, request, Response
 import app as app_module
 from utils.logging import sensor_logger as logger
 from utils.validation import validate_frequency, validate_device_index, validate_gain, validate_ppm
-from utils.sse import format_sse
+from utils.sse import format_sse, SSE_KEEPALIVE
 from utils.process import safe_terminate, register_process
 
 sensor_bp = Blueprint('sensor', __name__)
@@ -151,7 +151,7 @@ def stop_sensor() -> Response:
 
 @sensor_bp.route('/stream_sensor')
 def stream_sensor() -> Response:
-    def generate() -> Generator[str, None, None]:
+    def generate() -> Generator[bytes, None, None]:
         last_keepalive = time.time()
         keepalive_interval = 30.0
 
@@ -163,7 +163,7 @@ def stream_sensor() -> Response:
             except queue.Empty:
                 now = time.time()
                 if now - last_keepalive >= keepalive_interval:
-                    yield format_sse({'type': 'keepalive'})
+                    yield SSE_KEEPALIVE
                     last_keepalive = now
 
     response = Response(generate(), mimetype='text/event-stream')
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import csv
 import fcntl
 import json
 import os
 import platform
 import queue
 import re
+import selectors
 import subprocess
 import threading
 import time
@@ -20,7 +22,7 @@ from utils.dependencies import check_tool
 from utils.logging import wifi_logger as logger
 from utils.process import is_valid_mac, is_valid_channel
 from utils.validation import validate_wifi_channel, validate_mac_address
-from utils.sse import format_sse
+from utils.sse import format_sse_dict, SSE_KEEPALIVE
 from data.oui import get_manufacturer
 
 wifi_bp = Blueprint('wifi', __name__, url_prefix='/wifi')
@@ -29,6 +31,58 @@ wifi_bp = Blueprint('wifi', __name__, url_prefix='/wifi')
 pmkid_process = None
 pmkid_lock = threading.Lock()
 
+# Last aircrack-ng verdict per (capture file, BSSID): (file size, handshake found)
+HANDSHAKE_RECHECK_BYTES = 1024
+_handshake_cache = {}
+
+# Most queued events written as one response chunk when the stream falls behind
+SSE_BATCH_SIZE = 64
+
+# Put on a wifi_queue that start_wifi_scan() has replaced, so streams blocked
+# on it wake up and move over to the new queue
+_QUEUE_RETIRED = object()
+
+# Events discarded because wifi_queue was full (the SSE client fell behind)
+_dropped_events = 0
+_dropped_lock = threading.Lock()
+
+# One thread drains the stderr pipes of all running capture tools
+_stderr_selector = selectors.DefaultSelector()
+_stderr_pump_lock = threading.Lock()
+_stderr_pump_thread = None
+
+# fcntl only exposes F_SETPIPE_SZ from Python 3.10
+_F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+_PIPE_SIZE = 1 << 20
+
+# Patterns for finding the monitor interface name in airmon-ng output
+_MON_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'monitor mode.*enabled.*on\s+(\S+)',
+    r'\(monitor mode.*enabled.*?(\S+mon)\)',
+    r'created\s+(\S+mon)',
+    r'\bon\s+(\S+mon)\b',
+    r'\b(\S+mon)\b.*monitor',
+)]
+
+# Interface name at the start of each `ip link show` entry
+_IP_LINK_RE = re.compile(r'^\d+:\s+(\S+):', re.MULTILINE)
+
+# ANSI colour codes in tool error output
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Shared subprocess.run() arguments for short interface probe commands
+_RUN_KW = {'capture_output': True, 'text': True, 'timeout': 5}
+
+# Last parse of the airodump-ng CSV, reused while the file is unchanged
+_csv_path = None
+_csv_stamp = None
+_networks_cache = {}
+_clients_cache = {}
+
+# CSV row tuple and parsed dict per BSSID / station MAC from the last parse
+_network_rows = {}
+_client_rows = {}
+
 
 def detect_wifi_interfaces():
     """Detect available WiFi interfaces."""
@@ -36,8 +90,7 @@ def detect_wifi_interfaces():
 
     if platform.system() == 'Darwin':  # macOS
         try:
-            result = subprocess.run(['networksetup', '-listallhardwareports'],
-                                    capture_output=True, text=True, timeout=5)
+            result = subprocess.run(['networksetup', '-listallhardwareports'], **_RUN_KW)
             lines = result.stdout.split('\n')
             for i, line in enumerate(lines):
                 if 'Wi-Fi' in line or 'AirPort' in line:
@@ -69,7 +122,7 @@ def detect_wifi_interfaces():
 
     else:  # Linux
         try:
-            result = subprocess.run(['iw', 'dev'], capture_output=True, text=True, timeout=5)
+            result = subprocess.run(['iw', 'dev'], **_RUN_KW)
             current_iface = None
             for line in result.stdout.split('\n'):
                 line = line.strip()
@@ -86,7 +139,7 @@ def detect_wifi_interfaces():
                     current_iface = None
         except FileNotFoundError:
             try:
-                result = subprocess.run(['iwconfig'], capture_output=True, text=True, timeout=5)
+                result = subprocess.run(['iwconfig'], **_RUN_KW)
                 for line in result.stdout.split('\n'):
                     if 'IEEE 802.11' in line:
                         iface = line.split()[0]
@@ -105,154 +158,322 @@ def detect_wifi_interfaces():
 
 
 def parse_airodump_csv(csv_path):
-    """Parse airodump-ng CSV output file."""
+    """Parse airodump-ng CSV output file.
+
+    airodump-ng rewrites the whole CSV on every write interval, so the
+    previous result is returned as long as the file's mtime and size are
+    unchanged. Rows identical to the last parse reuse the same dict object,
+    which lets callers detect changes with an identity check.
+    """
+    global _csv_path, _csv_stamp, _networks_cache, _clients_cache
+    global _network_rows, _client_rows
+
+    try:
+        st = os.stat(csv_path)
+    except OSError as e:
+        logger.error(f"Error parsing CSV: {e}")
+        return {}, {}
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    if csv_path == _csv_path and stamp == _csv_stamp:
+        return _networks_cache, _clients_cache
+
     networks = {}
     clients = {}
+    network_rows = {}
+    client_rows = {}
 
     try:
-        with open(csv_path, 'r', errors='replace') as f:
-            content = f.read()
+        with open(csv_path, 'r', errors='replace', newline='') as f:
+            # One pass over the rows; blank rows end a section and the
+            # first field of a header row names the section that follows.
+            # NULs (seen in some ESSIDs and probes) are dropped first, since
+            # the csv module rejects them before Python 3.11.
+            section = None
+            for row in csv.reader(line.replace('\0', '') for line in f):
+                first = row[0].strip() if row else ''
+                if not first:
+                    section = None
+                    continue
+
+                if first == 'BSSID':
+                    section = 'networks'
+                elif first == 'Station MAC':
+                    section = 'clients'
+                elif section == 'networks' and ':' in first:
+                    # Compare the raw fields; airodump pads them with spaces,
+                    # so they are only stripped when the row has changed
+                    key = tuple(row[:14])
+                    cached = _network_rows.get(first)
+                    if cached and cached[0] == key:
+                        networks[first] = cached[1]
+                        network_rows[first] = cached
+                        continue
+                    try:
+                        (_, first_seen, last_seen, channel, speed, privacy, cipher,
+                         auth, power, beacons, ivs, lan_ip, _, essid) = key
+                    except ValueError:
+                        continue
+                    networks[first] = {
+                        'bssid': first,
+                        'first_seen': first_seen.strip(),
+                        'last_seen': last_seen.strip(),
+                        'channel': channel.strip(),
+                        'speed': speed.strip(),
+                        'privacy': privacy.strip(),
+                        'cipher': cipher.strip(),
+                        'auth': auth.strip(),
+                        'power': power.strip(),
+                        'beacons': beacons.strip(),
+                        'ivs': ivs.strip(),
+                        'lan_ip': lan_ip.strip(),
+                        'essid': essid.strip() or 'Hidden'
+                    }
+                    network_rows[first] = (key, networks[first])
+                elif section == 'clients' and ':' in first:
+                    key = tuple(row[:7])
+                    cached = _client_rows.get(first)
+                    if cached and cached[0] == key:
+                        clients[first] = cached[1]
+                        client_rows[first] = cached
+                        continue
+                    try:
+                        _, first_seen, last_seen, power, packets, bssid, *probes = key
+                    except ValueError:
+                        continue
+                    # The vendor depends only on the MAC, so keep it across row changes
+                    vendor = cached[1]['vendor'] if cached else get_manufacturer(first)
+                    clients[first] = {
+                        'mac': first,
+                        'first_seen': first_seen.strip(),
+                        'last_seen': last_seen.strip(),
+                        'power': power.strip(),
+                        'packets': packets.strip(),
+                        'bssid': bssid.strip(),
+                        'probes': probes[0].strip() if probes else '',
+                        'vendor': vendor
+                    }
+                    client_rows[first] = (key, clients[first])
+    except Exception as e:
+        logger.error(f"Error parsing CSV: {e}")
+        return networks, clients
+
+    _csv_path = csv_path
+    _csv_stamp = stamp
+    _networks_cache = networks
+    _clients_cache = clients
+    _network_rows = network_rows
+    _client_rows = client_rows
+    return networks, clients
 
-        sections = content.split('\n\n')
 
-        for section in sections:
-            lines = section.strip().split('\n')
-            if not lines:
+def _stderr_pump_loop():
+    """Read whatever is available on each registered pipe and dispatch it."""
+    while True:
+        for key, _ in _stderr_selector.select(timeout=0.5):
+            try:
+                data = key.fileobj.read()
+            except (OSError, ValueError):
+                data = b''
+            if data is None:
+                continue
+            if not data:
+                with _stderr_pump_lock:
+                    _stderr_selector.unregister(key.fileobj)
                 continue
+            for line in data.splitlines():
+                line = line.strip()
+                if line:
+                    try:
+                        key.data(line)
+                    except Exception as e:
+                        logger.debug(f"stderr handler failed: {e}")
 
-            header = lines[0] if lines else ''
-
-            if 'BSSID' in header and 'ESSID' in header:
-                for line in lines[1:]:
-                    parts = [p.strip() for p in line.split(',')]
-                    if len(parts) >= 14:
-                        bssid = parts[0]
-                        if bssid and ':' in bssid:
-                            networks[bssid] = {
-                                'bssid': bssid,
-                                'first_seen': parts[1],
-                                'last_seen': parts[2],
-                                'channel': parts[3],
-                                'speed': parts[4],
-                                'privacy': parts[5],
-                                'cipher': parts[6],
-                                'auth': parts[7],
-                                'power': parts[8],
-                                'beacons': parts[9],
-                                'ivs': parts[10],
-                                'lan_ip': parts[11],
-                                'essid': parts[13] or 'Hidden'
-                            }
-
-            elif 'Station MAC' in header:
-                for line in lines[1:]:
-                    parts = [p.strip() for p in line.split(',')]
-                    if len(parts) >= 6:
-                        station = parts[0]
-                        if station and ':' in station:
-                            vendor = get_manufacturer(station)
-                            clients[station] = {
-                                'mac': station,
-                                'first_seen': parts[1],
-                                'last_seen': parts[2],
-                                'power': parts[3],
-                                'packets': parts[4],
-                                'bssid': parts[5],
-                                'probes': parts[6] if len(parts) > 6 else '',
-                                'vendor': vendor
-                            }
-    except Exception as e:
-        logger.error(f"Error parsing CSV: {e}")
 
-    return networks, clients
+def _pump_stderr(pipe, on_line):
+    """Drain a child's stderr pipe on the shared pump thread.
+
+    Args:
+        pipe: Binary stderr pipe of a Popen object.
+        on_line: Called with each non-empty stripped line as bytes. The pipe
+            is dropped from the pump once it reaches EOF.
+    """
+    global _stderr_pump_thread
+
+    fd = pipe.fileno()
+    fl = fcntl.fcntl(fd, fcntl.F_GETFL)
+    fcntl.fcntl(fd, fcntl.F_SETFL, fl | os.O_NONBLOCK)
+
+    # Give bursts of output room while the pump is busy (Linux only)
+    try:
+        fcntl.fcntl(fd, _F_SETPIPE_SZ, _PIPE_SIZE)
+    except OSError:
+        pass
+
+    with _stderr_pump_lock:
+        _stderr_selector.register(pipe, selectors.EVENT_READ, on_line)
+        if _stderr_pump_thread is None or not _stderr_pump_thread.is_alive():
+            _stderr_pump_thread = threading.Thread(target=_stderr_pump_loop, daemon=True)
+            _stderr_pump_thread.start()
+
+
+def _emit(msg):
+    """Queue a WiFi event as an SSE frame, counting it as dropped if the queue is full."""
+    global _dropped_events
+    try:
+        app_module.wifi_queue.put_nowait(format_sse_dict(msg))
+    except queue.Full:
+        with _dropped_lock:
+            _dropped_events += 1
+
+
+def _retire_queue(q):
+    """Wake one stream blocked on a replaced queue; it passes the wake-up on."""
+    try:
+        q.put_nowait(_QUEUE_RETIRED)
+    except queue.Full:
+        # A full queue has no stream blocked on it
+        pass
+
+
+def _take_dropped():
+    """Return and reset the number of dropped WiFi events."""
+    global _dropped_events
+    with _dropped_lock:
+        count = _dropped_events
+        _dropped_events = 0
+    return count
+
+
+def _airodump_stderr_line(line):
+    """Report airodump-ng stderr output, skipping its status display."""
+    if not line.startswith(b'CH') and not line.startswith(b'Elapsed'):
+        text = line.decode('utf-8', errors='replace')
+        _emit({'type': 'error', 'text': f'airodump-ng: {text}'})
+
+
+def _hcxdumptool_stderr_line(line):
+    """Report hcxdumptool stderr output."""
+    text = line.decode('utf-8', errors='replace')
+    _emit({'type': 'info', 'text': f'hcxdumptool: {text}'})
 
 
 def stream_airodump_output(process, csv_path):
     """Stream airodump-ng output to queue."""
     try:
-        app_module.wifi_queue.put({'type': 'status', 'text': 'started'})
-        last_parse = 0
+        _emit({'type': 'status', 'text': 'started'})
+        next_parse = 0
+        last_mtime_ns = None
         start_time = time.time()
         csv_found = False
 
+        _pump_stderr(process.stderr, _airodump_stderr_line)
+
         while process.poll() is None:
-            try:
-                fd = process.stderr.fileno()
-                fl = fcntl.fcntl(fd, fcntl.F_GETFL)
-                fcntl.fcntl(fd, fcntl.F_SETFL, fl | os.O_NONBLOCK)
-
-                stderr_data = process.stderr.read()
-                if stderr_data:
-                    stderr_text = stderr_data.decode('utf-8', errors='replace').strip()
-                    if stderr_text:
-                        for line in stderr_text.split('\n'):
-                            line = line.strip()
-                            if line and not line.startswith('CH') and not line.startswith('Elapsed'):
-                                app_module.wifi_queue.put({'type': 'error', 'text': f'airodump-ng: {line}'})
-            except Exception:
-                pass
+            # Wake for the next CSV parse, checking for exit at least every 0.5 s
+            time.sleep(min(max(0, next_parse - time.time()), 0.5))
 
             current_time = time.time()
-            if current_time - last_parse >= 2:
+            if current_time >= next_parse:
+                # Retry quickly until airodump-ng has written its first CSV
+                next_parse = current_time + 0.5
                 csv_file = csv_path + '-01.csv'
-                if os.path.exists(csv_file):
+                try:
+                    mtime_ns = os.stat(csv_file).st_mtime_ns
+                except OSError:
+                    mtime_ns = None
+                if mtime_ns is not None:
                     csv_found = True
-                    networks, clients = parse_airodump_csv(csv_file)
+                    next_parse = current_time + 2
 
-                    for bssid, net in networks.items():
-                        if bssid not in app_module.wifi_networks:
-                            app_module.wifi_queue.put({
-                                'type': 'network',
-                                'action': 'new',
-                                **net
-                            })
-                        else:
-                            app_module.wifi_queue.put({
-                                'type': 'network',
-                                'action': 'update',
-                                **net
-                            })
+                # Nothing to diff until airodump-ng rewrites the file
+                if mtime_ns is not None and mtime_ns != last_mtime_ns:
+                    last_mtime_ns = mtime_ns
+                    networks, clients = parse_airodump_csv(csv_file)
 
-                    for mac, client in clients.items():
-                        if mac not in app_module.wifi_clients:
-                            app_module.wifi_queue.put({
-                                'type': 'client',
-                                'action': 'new',
-                                **client
-                            })
+                    # Parsed dicts are never mutated once published, so bind the
+                    # current snapshot once and swap in the new one at the end
+                    prev_networks = app_module.wifi_networks
+                    prev_clients = app_module.wifi_clients
+
+                    # Send the whole cycle as one snapshot event rather than one
+                    # event per row. Unchanged rows come back as the same dict.
+                    new_networks = [networks[b] for b in networks.keys() - prev_networks.keys()]
+                    updated_networks = [
+                        networks[b] for b in networks.keys() & prev_networks.keys()
+                        if networks[b] is not prev_networks[b]
+                    ]
+                    new_clients = [clients[m] for m in clients.keys() - prev_clients.keys()]
+
+                    if new_networks or updated_networks or new_clients:
+                        _emit({
+                            'type': 'snapshot',
+                            'new_networks': new_networks,
+                            'updated_networks': updated_networks,
+                            'new_clients': new_clients
+                        })
 
                     app_module.wifi_networks = networks
                     app_module.wifi_clients = clients
-                    last_parse = current_time
 
                 if current_time - start_time > 5 and not csv_found:
-                    app_module.wifi_queue.put({'type': 'error', 'text': 'No scan data after 5 seconds. Check if monitor mode is properly enabled.'})
+                    _emit({'type': 'error', 'text': 'No scan data after 5 seconds. Check if monitor mode is properly enabled.'})
                     start_time = current_time + 30
 
-            time.sleep(0.5)
-
-        try:
-            remaining_stderr = process.stderr.read()
-            if remaining_stderr:
-                stderr_text = remaining_stderr.decode('utf-8', errors='replace').strip()
-                if stderr_text:
-                    app_module.wifi_queue.put({'type': 'error', 'text': f'airodump-ng exited: {stderr_text}'})
-        except Exception:
-            pass
-
         exit_code = process.returncode
         if exit_code != 0 and exit_code is not None:
-            app_module.wifi_queue.put({'type': 'error', 'text': f'airodump-ng exited with code {exit_code}'})
+            _emit({'type': 'error', 'text': f'airodump-ng exited with code {exit_code}'})
 
     except Exception as e:
-        app_module.wifi_queue.put({'type': 'error', 'text': str(e)})
+        _emit({'type': 'error', 'text': str(e)})
     finally:
         process.wait()
-        app_module.wifi_queue.put({'type': 'status', 'text': 'stopped'})
+        _emit({'type': 'status', 'text': 'stopped'})
         with app_module.wifi_lock:
             app_module.wifi_process = None
 
 
+def get_wireless_interfaces():
+    """Return the names of all wireless interfaces currently present.
+
+    sysfs marks wireless interfaces with a 'wireless' directory, which is
+    enough on most systems; iwconfig and ip link are only consulted when it
+    finds none.
+    """
+    interfaces = set()
+    try:
+        with os.scandir('/sys/class/net') as entries:
+            for entry in entries:
+                if os.path.exists(os.path.join(entry.path, 'wireless')):
+                    interfaces.add(entry.name)
+    except OSError:
+        pass
+
+    if interfaces:
+        return interfaces
+
+    try:
+        result = subprocess.run(['iwconfig'], **_RUN_KW)
+        for line in result.stdout.split('\n'):
+            if line and not line.startswith(' ') and 'no wireless' not in line.lower():
+                iface = line.split()[0] if line.split() else None
+                if iface:
+                    interfaces.add(iface)
+    except (subprocess.SubprocessError, OSError):
+        pass
+
+    try:
+        result = subprocess.run(['ip', 'link', 'show'], **_RUN_KW)
+        for match in _IP_LINK_RE.finditer(result.stdout):
+            iface = match.group(1).rstrip(':')
+            if iface.startswith('wl') or 'mon' in iface:
+                interfaces.add(iface)
+    except (subprocess.SubprocessError, OSError):
+        pass
+
+    return interfaces
+
+
 @wifi_bp.route('/interfaces')
 def get_wifi_interfaces():
     """Get available WiFi interfaces."""
@@ -279,36 +500,6 @@ def toggle_monitor_mode():
     if action == 'start':
         if check_tool('airmon-ng'):
             try:
-                def get_wireless_interfaces():
-                    interfaces = set()
-                    try:
-                        result = subprocess.run(['iwconfig'], capture_output=True, text=True, timeout=5)
-                        for line in result.stdout.split('\n'):
-                            if line and not line.startswith(' ') and 'no wireless' not in line.lower():
-                                iface = line.split()[0] if line.split() else None
-                                if iface:
-                                    interfaces.add(iface)
-                    except (subprocess.SubprocessError, OSError):
-                        pass
-
-                    try:
-                        for iface in os.listdir('/sys/class/net'):
-                            if os.path.exists(f'/sys/class/net/{iface}/wireless'):
-                                interfaces.add(iface)
-                    except OSError:
-                        pass
-
-                    try:
-                        result = subprocess.run(['ip', 'link', 'show'], capture_output=True, text=True, timeout=5)
-                        for match in re.finditer(r'^\d+:\s+(\S+):', result.stdout, re.MULTILINE):
-                            iface = match.group(1).rstrip(':')
-                            if iface.startswith('wl') or 'mon' in iface:
-                                interfaces.add(iface)
-                    except (subprocess.SubprocessError, OSError):
-                        pass
-
-                    return interfaces
-
                 interfaces_before = get_wireless_interfaces()
 
                 kill_processes = data.get('kill_processes', False)
@@ -335,23 +526,18 @@ def toggle_monitor_mode():
                         monitor_iface = list(new_interfaces)[0]
 
                 if not monitor_iface:
-                    patterns = [
-                        r'monitor mode.*enabled.*on\s+(\S+)',
-                        r'\(monitor mode.*enabled.*?(\S+mon)\)',
-                        r'created\s+(\S+mon)',
-                        r'\bon\s+(\S+mon)\b',
-                        r'\b(\S+mon)\b.*monitor',
-                        r'\b(' + re.escape(interface) + r'mon)\b',
+                    patterns = _MON_PATTERNS + [
+                        re.compile(r'\b(' + re.escape(interface) + r'mon)\b', re.IGNORECASE),
                     ]
                     for pattern in patterns:
-                        match = re.search(pattern, output, re.IGNORECASE)
+                        match = pattern.search(output)
                         if match:
                             monitor_iface = match.group(1)
                             break
 
                 if not monitor_iface:
                     try:
-                        result = subprocess.run(['iwconfig', interface], capture_output=True, text=True, timeout=5)
+                        result = subprocess.run(['iwconfig', interface], **_RUN_KW)
                         if 'Mode:Monitor' in result.stdout:
                             monitor_iface = interface
                     except (subprocess.SubprocessError, OSError):
@@ -366,7 +552,7 @@ def toggle_monitor_mode():
                     monitor_iface = interface + 'mon'
 
                 app_module.wifi_monitor_interface = monitor_iface
-                app_module.wifi_queue.put({'type': 'info', 'text': f'Monitor mode enabled on {app_module.wifi_monitor_interface}'})
+                _emit({'type': 'info', 'text': f'Monitor mode enabled on {app_module.wifi_monitor_interface}'})
                 return jsonify({'status': 'success', 'monitor_interface': app_module.wifi_monitor_interface})
 
             except Exception as e:
@@ -426,15 +612,15 @@ def start_wifi_scan():
         app_module.wifi_networks = {}
         app_module.wifi_clients = {}
 
-        while not app_module.wifi_queue.empty():
-            try:
-                app_module.wifi_queue.get_nowait()
-            except queue.Empty:
-                break
+        # Start from an empty queue. Open SSE streams re-read the attribute
+        # on every get; the sentinel wakes any that are blocked on the old one.
+        old_queue = app_module.wifi_queue
+        app_module.wifi_queue = queue.Queue(maxsize=old_queue.maxsize)
+        _retire_queue(old_queue)
 
         csv_path = '/tmp/intercept_wifi'
 
-        for f in [f'/tmp/intercept_wifi-01.csv', f'/tmp/intercept_wifi-01.cap']:
+        for f in (csv_path + '-01.csv', csv_path + '-01.cap'):
             try:
                 os.remove(f)
             except OSError:
@@ -469,7 +655,7 @@ def start_wifi_scan():
                 app_module.wifi_process = None
 
                 error_msg = stderr_output or stdout_output or f'Process exited with code {exit_code}'
-                error_msg = re.sub(r'\x1b\[[0-9;]*m', '', error_msg)
+                error_msg = _ANSI_RE.sub('', error_msg)
 
                 if 'No such device' in error_msg or 'No such interface' in error_msg:
                     error_msg = f'Interface "{interface}" not found.'
@@ -482,7 +668,7 @@ def start_wifi_scan():
             thread.daemon = True
             thread.start()
 
-            app_module.wifi_queue.put({'type': 'info', 'text': f'Started scanning on {interface}'})
+            _emit({'type': 'info', 'text': f'Started scanning on {interface}'})
 
             return jsonify({'status': 'started', 'interface': interface})
 
@@ -547,7 +733,7 @@ def send_deauth():
             interface
         ]
 
-        app_module.wifi_queue.put({'type': 'info', 'text': f'Sending {count} deauth packets to {target_bssid}'})
+        _emit({'type': 'info', 'text': f'Sending {count} deauth packets to {target_bssid}'})
 
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
 
@@ -583,7 +769,8 @@ def capture_handshake():
         if app_module.wifi_process:
             return jsonify({'status': 'error', 'message': 'Scan already running.'})
 
-        capture_path = f'/tmp/intercept_handshake_{target_bssid.replace(":", "")}'
+        bssid_id = target_bssid.replace(':', '')
+        capture_path = f'/tmp/intercept_handshake_{bssid_id}'
 
         cmd = [
             'airodump-ng',
@@ -596,7 +783,8 @@ def capture_handshake():
 
         try:
             app_module.wifi_process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            app_module.wifi_queue.put({'type': 'info', 'text': f'Capturing handshakes for {target_bssid}'})
+            _pump_stderr(app_module.wifi_process.stderr, _airodump_stderr_line)
+            _emit({'type': 'info', 'text': f'Capturing handshakes for {target_bssid}'})
             return jsonify({'status': 'started', 'capture_file': capture_path + '-01.cap'})
         except Exception as e:
             return jsonify({'status': 'error', 'message': str(e)})
@@ -621,9 +809,20 @@ def check_handshake_status():
 
     file_size = os.path.getsize(capture_file)
     handshake_found = False
+    capturing = bool(app_module.wifi_process and app_module.wifi_process.poll() is None)
+
+    # While capturing, only re-run aircrack-ng once the file has grown by
+    # HANDSHAKE_RECHECK_BYTES. Once capture stops the file is final, so any
+    # size change since the last check (e.g. the tail flushed on exit) is
+    # rechecked. A found handshake stays found while the file keeps growing.
+    recheck_bytes = HANDSHAKE_RECHECK_BYTES if capturing else 1
+    cache_key = (capture_file, target_bssid)
+    cached = _handshake_cache.get(cache_key)
 
     try:
-        if target_bssid and is_valid_mac(target_bssid):
+        if cached and cached[0] <= file_size and (cached[1] or file_size < cached[0] + recheck_bytes):
+            handshake_found = cached[1]
+        elif target_bssid and is_valid_mac(target_bssid):
             result = subprocess.run(
                 ['aircrack-ng', '-a', '2', '-b', target_bssid, capture_file],
                 capture_output=True, text=True, timeout=10
@@ -632,13 +831,14 @@ def check_handshake_status():
             if '1 handshake' in output or ('handshake' in output.lower() and 'wpa' in output.lower()):
                 if '0 handshake' not in output:
                     handshake_found = True
+            _handshake_cache[cache_key] = (file_size, handshake_found)
     except subprocess.TimeoutExpired:
         pass
     except Exception as e:
         logger.error(f"Error checking handshake: {e}")
 
     return jsonify({
-        'status': 'running' if app_module.wifi_process and app_module.wifi_process.poll() is None else 'stopped',
+        'status': 'running' if capturing else 'stopped',
         'file_exists': True,
         'file_size': file_size,
         'file': capture_file,
@@ -666,10 +866,11 @@ def capture_pmkid():
         if pmkid_process and pmkid_process.poll() is None:
             return jsonify({'status': 'error', 'message': 'PMKID capture already running'})
 
-        capture_path = f'/tmp/intercept_pmkid_{target_bssid.replace(":", "")}.pcapng'
-        filter_file = f'/tmp/pmkid_filter_{target_bssid.replace(":", "")}'
+        bssid_id = target_bssid.replace(':', '')
+        capture_path = f'/tmp/intercept_pmkid_{bssid_id}.pcapng'
+        filter_file = f'/tmp/pmkid_filter_{bssid_id}'
         with open(filter_file, 'w') as f:
-            f.write(target_bssid.replace(':', '').lower())
+            f.write(bssid_id.lower())
 
         cmd = [
             'hcxdumptool',
@@ -684,7 +885,9 @@ def capture_pmkid():
             cmd.extend(['-c', str(channel)])
 
         try:
-            pmkid_process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # --enable_status writes to stdout, which nothing reads
+            pmkid_process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            _pump_stderr(pmkid_process.stderr, _hcxdumptool_stderr_line)
             return jsonify({'status': 'started', 'file': capture_path})
         except FileNotFoundError:
             return jsonify({'status': 'error', 'message': 'hcxdumptool not found.'})
@@ -748,9 +951,11 @@ def stop_pmkid():
 @wifi_bp.route('/networks')
 def get_wifi_networks():
     """Get current list of discovered networks."""
+    networks = app_module.wifi_networks
+    clients = app_module.wifi_clients
     return jsonify({
-        'networks': list(app_module.wifi_networks.values()),
-        'clients': list(app_module.wifi_clients.values()),
+        'networks': list(networks.values()),
+        'clients': list(clients.values()),
         'handshakes': app_module.wifi_handshakes,
         'monitor_interface': app_module.wifi_monitor_interface
     })
@@ -760,19 +965,41 @@ def get_wifi_networks():
 def stream_wifi():
     """SSE stream for WiFi events."""
     def generate():
-        last_keepalive = time.time()
         keepalive_interval = 30.0
+        next_keepalive = time.monotonic() + keepalive_interval
 
         while True:
+            # Block until an event arrives or the next keepalive is due
+            q = app_module.wifi_queue
+            wait = next_keepalive - time.monotonic()
             try:
-                msg = app_module.wifi_queue.get(timeout=1)
-                last_keepalive = time.time()
-                yield format_sse(msg)
+                frame = q.get(timeout=max(wait, 0))
             except queue.Empty:
-                now = time.time()
-                if now - last_keepalive >= keepalive_interval:
-                    yield format_sse({'type': 'keepalive'})
-                    last_keepalive = now
+                yield SSE_KEEPALIVE
+                next_keepalive = time.monotonic() + keepalive_interval
+                continue
+            if frame is _QUEUE_RETIRED:
+                _retire_queue(q)
+                continue
+            next_keepalive = time.monotonic() + keepalive_interval
+
+            # Events arrive already encoded by _emit(); send whatever else is
+            # queued along with this one as a single chunk
+            batch = [frame]
+            while len(batch) < SSE_BATCH_SIZE:
+                try:
+                    frame = q.get_nowait()
+                except queue.Empty:
+                    break
+                if frame is _QUEUE_RETIRED:
+                    _retire_queue(q)
+                    break
+                batch.append(frame)
+            yield b''.join(batch)
+
+            dropped = _take_dropped()
+            if dropped:
+                yield format_sse_dict({'type': 'dropped', 'count': dropped})
 
     response = Response(generate(), mimetype='text/event-stream')
     response.headers['Cache-Control'] = 'no-cache'
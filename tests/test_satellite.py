@@ -0,0 +1,167 @@
+"""Tests for satellite tracking helpers."""
+
+import gzip
+import io
+
+import pytest
+import routes.satellite as sat_routes
+from routes.satellite import _pair_rise_set, _parse_tle_block
+
+
+TLE_TEXT = (
+    b"ISS (ZARYA)             \r\n"
+    b"1 25544U 98067A   24001.00000000  .00000000  00000-0  00000-0 0  0000\r\n"
+    b"2 25544  51.6400   0.0000 0000000   0.0000   0.0000 15.50000000000000\r\n"
+    b"garbage line\r\n"
+    b"NOAA 15\r\n"
+    b"1 25338U 98030A   24001.00000000  .00000-0  00000-0  00000-0 0  0000\r\n"
+    b"2 25338  98.7300   0.0000 0010000   0.0000   0.0000 14.26000000000000\r\n"
+)
+
+
+class TestTleParsing:
+    """Tests for TLE block parsing."""
+
+    def test_parse_records(self):
+        """Test that valid records are parsed and junk lines skipped."""
+        records = _parse_tle_block(TLE_TEXT.splitlines())
+        assert [r[:2] for r in records] == [('ISS (ZARYA)', 25544), ('NOAA 15', 25338)]
+        assert records[0][2].startswith('1 25544U')
+        assert records[0][3].startswith('2 25544 ')
+
+    def test_invalid_norad(self):
+        """Test that records with a non-numeric catalog number are skipped."""
+        lines = [b'BAD', b'1 ABCDEU 98067A', b'2 ABCDE  51.6400']
+        assert _parse_tle_block(lines) == []
+
+    def test_spaced_norad_skips_only_that_record(self):
+        """Test that a catalog number with embedded spaces skips just its record."""
+        lines = [b'BAD', b'1 2 345U 98067A', b'2 2 345  51.6400'] + TLE_TEXT.splitlines()
+        records = _parse_tle_block(lines)
+        assert [r[:2] for r in records] == [('ISS (ZARYA)', 25544), ('NOAA 15', 25338)]
+
+
+class TestPassPairing:
+    """Tests for rise/set event pairing."""
+
+    def test_pairs_rise_with_next_set(self):
+        """Test that each rise is matched with the following set."""
+        assert _pair_rise_set([True, False, True, False]) == [(0, 1), (2, 3)]
+
+    def test_leading_set_and_trailing_rise(self):
+        """Test that a set before any rise and an unfinished pass are dropped."""
+        assert _pair_rise_set([False, True, False, True]) == [(1, 2)]
+
+    def test_no_events(self):
+        """Test empty input."""
+        assert _pair_rise_set([]) == []
+
+
+class TestBatchPropagation:
+    """Tests for vectorized SGP4 propagation."""
+
+    def test_matches_per_satellite(self):
+        """Test that the batch path agrees with skyfield's per-satellite path."""
+        pytest.importorskip('skyfield')
+        from skyfield.api import wgs84
+        from routes.satellite import _propagate_batch, _sat_cache, _TS
+
+        t = _TS.utc(2024, 1, 1, 12)
+        observer = wgs84.latlon(51.5074, -0.1278)
+        satellites = list(_sat_cache.values())
+        batch = _propagate_batch(satellites, t, observer)
+
+        for idx, satellite in enumerate(satellites):
+            subpoint = wgs84.subpoint(satellite.at(t))
+            alt, az, distance = (satellite - observer).at(t).altaz()
+            assert batch['ok'][idx]
+            assert batch['lat'][idx] == pytest.approx(subpoint.latitude.degrees)
+            assert batch['lon'][idx] == pytest.approx(subpoint.longitude.degrees)
+            assert batch['el'][idx] == pytest.approx(alt.degrees)
+            assert batch['az'][idx] == pytest.approx(az.degrees)
+            assert batch['range_km'][idx] == pytest.approx(distance.km)
+
+    def test_tracks_match_per_satellite(self):
+        """Test that batched ground tracks agree with skyfield to within a few meters."""
+        pytest.importorskip('skyfield')
+        from skyfield.api import wgs84
+        from routes.satellite import _propagate_tracks, _sat_cache, _TS
+
+        t = _TS.utc(2024, 1, 1, 12)
+        offsets = [-45, 0, 45]
+        satellites = list(_sat_cache.values())
+        tracks = _propagate_tracks(satellites, t, offsets)
+
+        for idx, satellite in enumerate(satellites):
+            subpoint = wgs84.subpoint(satellite.at(_TS.utc(2024, 1, 1, 12, offsets)))
+            assert tracks['ok'][idx].all()
+            assert tracks['lat'][idx] == pytest.approx(subpoint.latitude.degrees, abs=1e-4)
+            assert tracks['lon'][idx] == pytest.approx(subpoint.longitude.degrees, abs=1e-4)
+
+
+class TestTleDownload:
+    """Tests for CelesTrak TLE downloads."""
+
+    class _FakeResponse(io.BytesIO):
+        def __init__(self, body, encoding=''):
+            super().__init__(body)
+            self.headers = {'Content-Encoding': encoding} if encoding else {}
+
+    def _serve(self, monkeypatch, body, encoding=''):
+        monkeypatch.setattr(
+            sat_routes.urllib.request, 'urlopen',
+            lambda req, timeout: self._FakeResponse(body, encoding)
+        )
+
+    def test_gzip_body_is_decompressed(self, monkeypatch):
+        """Test that a gzip-encoded body is returned decompressed."""
+        self._serve(monkeypatch, gzip.compress(TLE_TEXT), 'gzip')
+        assert sat_routes._download_tle('stations') == TLE_TEXT
+
+    def test_plain_body_larger_than_one_megabyte(self, monkeypatch):
+        """Test that an uncompressed large group is accepted."""
+        body = TLE_TEXT * (2 * 1024 * 1024 // len(TLE_TEXT))
+        self._serve(monkeypatch, body)
+        assert sat_routes._download_tle('starlink') == body
+
+    def test_decompressed_size_is_capped(self, monkeypatch):
+        """Test that a small gzip body cannot expand past the limit."""
+        monkeypatch.setattr(sat_routes, 'MAX_TLE_RESPONSE_SIZE', 1024)
+        self._serve(monkeypatch, gzip.compress(b'\0' * 4096), 'gzip')
+        with pytest.raises(ValueError):
+            sat_routes._download_tle('stations')
+
+
+class TestJsonResponse:
+    """Tests for JSON response encoding."""
+
+    def test_falls_back_for_values_orjson_rejects(self):
+        """Test that payloads orjson cannot encode are still serialized."""
+        from flask import Flask
+
+        with Flask(__name__).app_context():
+            response = sat_routes._json_response({'big': 2 ** 70})
+        assert response.get_json() == {'big': 2 ** 70}
+
+class TestPassPrediction:
+    """Tests for the pass prediction endpoint."""
+
+    def test_current_position_is_not_cached(self, monkeypatch):
+        """Test that currentPos is computed per request while passes are memoized."""
+        pytest.importorskip('skyfield')
+        from flask import Flask
+
+        app = Flask(__name__)
+        app.register_blueprint(sat_routes.satellite_bp)
+        client = app.test_client()
+        payload = {'satellites': ['ISS'], 'hours': 24, 'minEl': 0}
+        monkeypatch.setattr(sat_routes.time, 'time', lambda: 1_700_000_000.0)
+
+        first = client.post('/satellite/predict', json=payload).json['passes']
+        real_now = sat_routes._TS.now
+        monkeypatch.setattr(sat_routes._TS, 'now', lambda: real_now() + 30 / 86400)
+        second = client.post('/satellite/predict', json=payload).json['passes']
+
+        assert first and len(first) == len(second)
+        assert first[0]['startTime'] == second[0]['startTime']
+        assert first[0]['currentPos'] != second[0]['currentPos']
@@ -1,8 +1,21 @@
 """Tests for utility modules."""
 
+import json
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
+
 import pytest
-from utils.process import is_valid_mac, is_valid_channel
+from utils import cleanup, process
+from utils.process import is_valid_mac, is_valid_channel, detect_devices
 from utils.dependencies import check_tool
+from utils.sse import clear_queue, format_sse, format_sse_dict, sse_stream, SSE_KEEPALIVE
+from utils.cleanup import CleanupManager, DataStore, cleanup_dict
 from data.oui import get_manufacturer
 
 
@@ -22,6 +35,8 @@ class TestMacValidation:
         assert is_valid_mac('invalid') is False
         assert is_valid_mac('AA:BB:CC:DD:EE') is False
         assert is_valid_mac('AA-BB-CC-DD-EE-FF') is False
+        assert is_valid_mac('AA:BB:CC:DD:EE:FF\n') is False
+        assert is_valid_mac('AA:BB:CC:DD:EE:FG') is False
 
 
 class TestChannelValidation:
@@ -71,3 +86,292 @@ class TestOuiLookup:
         """Test looking up unknown manufacturer."""
         result = get_manufacturer('FF:FF:FF:FF:FF:FF')
         assert result == 'Unknown'
+
+
+class TestFormatSse:
+    """Tests for SSE message formatting."""
+
+    def test_dict_payload(self):
+        """Test that dict payloads are JSON encoded into a data line."""
+        msg = format_sse({'type': 'info', 'text': 'hello', 'n': 1})
+        assert msg.startswith(b'data: ')
+        assert msg.endswith(b'\n\n')
+        assert json.loads(msg[len(b'data: '):]) == {'type': 'info', 'text': 'hello', 'n': 1}
+
+    def test_event_name(self):
+        """Test that an event name is emitted before the data line."""
+        assert format_sse('ping', event='keepalive') == b'event: keepalive\ndata: ping\n\n'
+
+    def test_dict_fast_path(self):
+        """Test that the dict fast path matches format_sse."""
+        data = {'type': 'network', 'bssid': 'AA:BB:CC:DD:EE:FF'}
+        assert format_sse_dict(data) == format_sse(data)
+
+    def test_non_str_keys(self):
+        """Test that non-string keys and wide integers still encode."""
+        msg = format_sse({1: 'a', 'big': 2 ** 70})
+        assert json.loads(msg[len(b'data: '):]) == {'1': 'a', 'big': 2 ** 70}
+
+
+class TestSseStream:
+    """Tests for the SSE queue stream."""
+
+    def test_message_then_keepalive(self):
+        """Test that queued messages stream and an idle queue keeps alive."""
+        q = queue.Queue()
+        q.put({'type': 'info'})
+        stream = sse_stream(q, keepalive_interval=0.05)
+        assert next(stream) == format_sse({'type': 'info'})
+        start = time.monotonic()
+        assert next(stream) == SSE_KEEPALIVE
+        assert time.monotonic() - start >= 0.04
+
+    def test_stop_check(self):
+        """Test that the stream ends once stop_check returns True."""
+        stop = threading.Event()
+        stream = sse_stream(queue.Queue(), timeout=0.01, stop_check=stop.is_set)
+        threading.Timer(0.05, stop.set).start()
+        assert list(stream) == []
+
+
+class TestClearQueue:
+    """Tests for queue clearing."""
+
+    def test_clear_unblocks_producer(self):
+        """Test that clearing empties the queue and frees blocked producers."""
+        q = queue.Queue(maxsize=2)
+        q.put(1)
+        q.put(2)
+        producer = threading.Thread(target=q.put, args=(3,))
+        producer.start()
+        time.sleep(0.05)
+        assert clear_queue(q) == 2
+        producer.join(timeout=1)
+        assert not producer.is_alive()
+        assert q.get_nowait() == 3
+        q.task_done()
+        q.join()
+
+
+class TestDataStore:
+    """Tests for the cleanup data store."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Replace the store's monotonic clock with a manually advanced one."""
+        now = [1000.0]
+        monkeypatch.setattr(cleanup, 'time', SimpleNamespace(monotonic=lambda: now[0]))
+
+        def advance(seconds):
+            now[0] += seconds
+        return advance
+
+    def test_set_get_delete(self):
+        """Test basic entry lifecycle."""
+        store = DataStore(name='test')
+        store.set('a', {'x': 1})
+        store.update('a', {'y': 2})
+        assert store.get('a') == {'x': 1, 'y': 2}
+        assert 'a' in store and len(store) == 1
+        assert store.delete('a') is True
+        assert store.delete('a') is False
+        assert store.get('a', 'missing') == 'missing'
+
+    def test_snapshot_follows_writes(self):
+        """Test that all/values/items reflect writes and return copies."""
+        store = DataStore(name='test')
+        store.set('a', {'n': 1})
+        assert store.all() == {'a': {'n': 1}}
+        store.update('a', {'n': 2})
+        store.set('b', 3)
+        assert store.all() == {'a': {'n': 2}, 'b': 3}
+        store.delete('a')
+        assert store.items() == [('b', 3)]
+        store.all()['c'] = 4
+        assert store.values() == [3]
+
+    def test_cleanup_removes_only_stale(self, clock):
+        """Test that cleanup removes entries older than max_age."""
+        store = DataStore(max_age_seconds=60, name='test')
+        store.set('old', 1)
+        clock(120)
+        store.set('new', 2)
+        assert store.cleanup() == 1
+        assert store.keys() == ['new']
+
+    def test_explicit_now(self):
+        """Test that writes accept a shared monotonic timestamp."""
+        store = DataStore(max_age_seconds=60, name='test')
+        now = time.monotonic()
+        store.set('old', 1, now=now - 120)
+        store.set('new', 2, now=now)
+        assert store.cleanup() == 1
+        assert store.keys() == ['new']
+
+    def test_touched_entry_survives_cleanup(self, clock):
+        """Test that touching an entry postpones its expiry."""
+        store = DataStore(max_age_seconds=60, name='test')
+        store.set('a', 1)
+        store.set('b', 2)
+        clock(40)
+        store.touch('a')
+        clock(40)
+        assert store.cleanup() == 1
+        assert store.keys() == ['a']
+        clock(61)
+        assert store.cleanup() == 1
+        assert len(store) == 0
+
+    def test_stale_touch_does_not_rewind(self):
+        """Test that a pending touch older than a later set is ignored."""
+        store = DataStore(max_age_seconds=60, name='test')
+        now = time.monotonic()
+        store.set('a', 1, now=now - 120)
+        store.touch('a', now=now - 90)
+        store.set('a', 2, now=now)
+        assert store.cleanup() == 0
+        assert store.get('a') == 2
+
+    def test_touch_missing_key_is_ignored(self):
+        """Test that touching absent or deleted keys records nothing."""
+        store = DataStore(name='test')
+        store.touch('never-set')
+        store.set('a', 1)
+        store.touch('a')
+        store.delete('a')
+        assert store._pending_touch == {}
+
+    def test_deleted_and_readded_entry(self, clock):
+        """Test that a re-added key is not expired by its old schedule."""
+        store = DataStore(max_age_seconds=60, name='test')
+        store.set('a', 1)
+        store.delete('a')
+        clock(61)
+        store.set('a', 2)
+        assert store.cleanup() == 0
+        assert store.get('a') == 2
+
+    def test_concurrent_writers(self):
+        """Test that concurrent writers to many keys lose no entries."""
+        store = DataStore(name='test')
+
+        def writer(offset):
+            for i in range(500):
+                store.set(f'{offset}-{i}', i)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(store) == 8 * 500
+        assert len(store.all()) == 8 * 500
+
+
+class TestCleanupDict:
+    """Tests for timestamp-dict cleanup."""
+
+    def test_removes_expired_keys(self):
+        """Test that only keys older than max_age are removed from both dicts."""
+        data = {'old': 1, 'new': 2}
+        timestamps = {'old': 100.0, 'new': 390.0}
+        assert cleanup_dict(data, timestamps, max_age_seconds=60, now=400.0) == ['old']
+        assert data == {'new': 2}
+        assert timestamps == {'new': 390.0}
+
+    def test_default_clock_is_monotonic(self):
+        """Test that timestamps recorded with time.monotonic() expire by default."""
+        now = time.monotonic()
+        data = {'old': 1, 'new': 2}
+        timestamps = {'old': now - 400, 'new': now}
+        assert cleanup_dict(data, timestamps, max_age_seconds=300) == ['old']
+        assert data == {'new': 2}
+
+
+class TestCleanupManager:
+    """Tests for the periodic cleanup manager."""
+
+    def test_periodic_cleanup_and_stop(self):
+        """Test that one thread cleans registered stores until stopped."""
+        store = DataStore(max_age_seconds=0.01, name='test')
+        manager = CleanupManager(interval=0.02)
+        manager.register(store)
+        store.set('a', 1)
+        manager.start()
+        try:
+            deadline = time.time() + 2
+            while len(store) and time.time() < deadline:
+                time.sleep(0.01)
+            assert len(store) == 0
+            thread = manager._thread
+            assert thread.is_alive()
+        finally:
+            manager.stop()
+        thread.join(timeout=1)
+        assert not thread.is_alive()
+
+
+class TestDetectDevices:
+    """Tests for RTL-SDR device detection."""
+
+    RTL_TEST_OUTPUT = (
+        "Found 2 device(s):\n"
+        "  0:  Realtek, RTL2838UHIDIR, SN: 00000001\n"
+        "  1:  Generic RTL2832U OEM\n"
+        "\n"
+        "Using device 0: Generic RTL2832U OEM\n"
+        "Supported gain values (29): 0.0 0.9 1.4\n"
+    )
+
+    def _fake_rtl_test(self, monkeypatch, output):
+        monkeypatch.setattr(process, 'check_tool', lambda name: True)
+        monkeypatch.setattr(
+            process.subprocess, 'run',
+            lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 0, stdout='', stderr=output)
+        )
+
+    def test_parse_device_lines(self, monkeypatch):
+        """Test that device lines are parsed with name and serial."""
+        self._fake_rtl_test(monkeypatch, self.RTL_TEST_OUTPUT)
+        assert detect_devices() == [
+            {'index': 0, 'name': 'Realtek, RTL2838UHIDIR', 'serial': '00000001'},
+            {'index': 1, 'name': 'Generic RTL2832U OEM', 'serial': 'N/A'},
+        ]
+
+    def test_fallback_to_found_count(self, monkeypatch):
+        """Test that a bare device count yields placeholder devices."""
+        self._fake_rtl_test(monkeypatch, "Found 1 device(s):\n")
+        assert detect_devices() == [{'index': 0, 'name': 'RTL-SDR Device 0', 'serial': 'Unknown'}]
+
+
+class TestStaleProcesses:
+    """Tests for stale process cleanup."""
+
+    @pytest.mark.skipif(not os.path.isdir('/proc'), reason='requires procfs')
+    def test_kills_matching_process(self, tmp_path, monkeypatch):
+        """Test that only processes named like a stale tool are targeted."""
+        name = f'icpt_stale_{os.getpid() % 10000}'
+        monkeypatch.setattr(process, '_STALE_PROCESS_NAMES', frozenset({name}))
+        killed = []
+        monkeypatch.setattr(process.os, 'kill', lambda pid, sig: killed.append((pid, sig)))
+
+        fake_tool = tmp_path / name
+        shutil.copy(shutil.which('sleep'), fake_tool)
+        proc = subprocess.Popen([str(fake_tool), '30'])
+        other = subprocess.Popen(['sleep', '30'])
+        try:
+            # comm is set once the child has exec'd the copied binary
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                with open(f'/proc/{proc.pid}/comm') as f:
+                    if f.read().rstrip('\n') == name:
+                        break
+                time.sleep(0.01)
+            process.cleanup_stale_processes()
+            assert killed == [(proc.pid, signal.SIGKILL)]
+        finally:
+            monkeypatch.undo()
+            proc.kill()
+            other.kill()
+            proc.wait()
+            other.wait()
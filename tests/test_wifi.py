@@ -0,0 +1,239 @@
+"""Tests for WiFi reconnaissance helpers."""
+
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+import routes.wifi as wifi
+from routes.wifi import parse_airodump_csv
+from utils.sse import format_sse
+
+
+AIRODUMP_CSV = (
+    "\r\n"
+    "BSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, "
+    "Authentication, Power, # beacons, # IV, LAN IP, ID-length, ESSID, Key\r\n"
+    "AA:BB:CC:DD:EE:01, 2024-01-01 10:00:00, 2024-01-01 10:05:00,  6,  54, WPA2, "
+    "CCMP, PSK, -40,      120,        5,   0.  0.  0.   0,   7, HomeNet, \r\n"
+    "AA:BB:CC:DD:EE:02, 2024-01-01 10:00:01, 2024-01-01 10:05:01, 11, 130, OPN, "
+    ", , -70,       30,        0,   0.  0.  0.   0,   0, , \r\n"
+    "\r\n"
+    "Station MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs\r\n"
+    "00:1A:11:00:00:01, 2024-01-01 10:01:00, 2024-01-01 10:05:00, -50,       42, "
+    "AA:BB:CC:DD:EE:01, HomeNet\r\n"
+    "00:1A:11:00:00:02, 2024-01-01 10:02:00, 2024-01-01 10:04:00, -65,        3, "
+    "(not associated) , \r\n"
+    "\r\n"
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Write a sample airodump-ng CSV and return its path."""
+    path = tmp_path / 'scan-01.csv'
+    path.write_bytes(AIRODUMP_CSV.encode())
+    return str(path)
+
+
+class TestAirodumpCsv:
+    """Tests for airodump-ng CSV parsing."""
+
+    def test_parse_networks(self, csv_file):
+        """Test that access points are parsed with stripped fields."""
+        networks, _ = parse_airodump_csv(csv_file)
+        assert set(networks) == {'AA:BB:CC:DD:EE:01', 'AA:BB:CC:DD:EE:02'}
+        net = networks['AA:BB:CC:DD:EE:01']
+        assert net['channel'] == '6'
+        assert net['privacy'] == 'WPA2'
+        assert net['power'] == '-40'
+        assert net['essid'] == 'HomeNet'
+        assert networks['AA:BB:CC:DD:EE:02']['essid'] == 'Hidden'
+
+    def test_parse_clients(self, csv_file):
+        """Test that stations are parsed with vendor lookup."""
+        _, clients = parse_airodump_csv(csv_file)
+        assert set(clients) == {'00:1A:11:00:00:01', '00:1A:11:00:00:02'}
+        client = clients['00:1A:11:00:00:01']
+        assert client['bssid'] == 'AA:BB:CC:DD:EE:01'
+        assert client['probes'] == 'HomeNet'
+        assert client['vendor'] == 'Google'
+        assert clients['00:1A:11:00:00:02']['probes'] == ''
+
+    def test_unchanged_file_is_cached(self, csv_file):
+        """Test that an unchanged file returns the previous result."""
+        first = parse_airodump_csv(csv_file)
+        second = parse_airodump_csv(csv_file)
+        assert first[0] is second[0]
+        assert first[1] is second[1]
+
+    def test_rewritten_file_is_reparsed(self, csv_file):
+        """Test that a rewritten file is parsed again."""
+        networks, _ = parse_airodump_csv(csv_file)
+        with open(csv_file, 'ab') as f:
+            f.write(b"\r\n")
+        st = os.stat(csv_file)
+        os.utime(csv_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        reparsed, _ = parse_airodump_csv(csv_file)
+        assert reparsed is not networks
+        assert reparsed == networks
+
+    def test_unchanged_rows_are_reused(self, csv_file):
+        """Test that only changed rows get a new dict on re-parse."""
+        networks, clients = parse_airodump_csv(csv_file)
+        changed = AIRODUMP_CSV.replace('-40,', '-42,')
+        with open(csv_file, 'wb') as f:
+            f.write(changed.encode())
+        st = os.stat(csv_file)
+        os.utime(csv_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        reparsed, reparsed_clients = parse_airodump_csv(csv_file)
+        assert reparsed['AA:BB:CC:DD:EE:01'] is not networks['AA:BB:CC:DD:EE:01']
+        assert reparsed['AA:BB:CC:DD:EE:01']['power'] == '-42'
+        assert reparsed['AA:BB:CC:DD:EE:02'] is networks['AA:BB:CC:DD:EE:02']
+        assert reparsed_clients['00:1A:11:00:00:01'] is clients['00:1A:11:00:00:01']
+
+    def test_changed_client_keeps_vendor(self, csv_file, monkeypatch):
+        """Test that a changed client row does not repeat the vendor lookup."""
+        parse_airodump_csv(csv_file)
+        monkeypatch.setattr('routes.wifi.get_manufacturer', pytest.fail)
+        changed = AIRODUMP_CSV.replace('-50,', '-55,')
+        with open(csv_file, 'wb') as f:
+            f.write(changed.encode())
+        st = os.stat(csv_file)
+        os.utime(csv_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        _, clients = parse_airodump_csv(csv_file)
+        assert clients['00:1A:11:00:00:01']['power'] == '-55'
+        assert clients['00:1A:11:00:00:01']['vendor'] == 'Google'
+
+    def test_nul_in_essid(self, tmp_path):
+        """Test that a NUL inside a field does not cut the parse short."""
+        path = tmp_path / 'scan-01.csv'
+        path.write_bytes(AIRODUMP_CSV.replace('HomeNet, \r\n', 'Home\0Net, \r\n').encode())
+        networks, clients = parse_airodump_csv(str(path))
+        assert networks['AA:BB:CC:DD:EE:01']['essid'] == 'HomeNet'
+        assert 'AA:BB:CC:DD:EE:02' in networks
+        assert set(clients) == {'00:1A:11:00:00:01', '00:1A:11:00:00:02'}
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file yields no results."""
+        assert parse_airodump_csv(str(tmp_path / 'missing.csv')) == ({}, {})
+
+
+class TestHandshakeStatus:
+    """Tests for the handshake status check."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a test client with only the WiFi blueprint."""
+        app = Flask(__name__)
+        app.register_blueprint(wifi.wifi_bp)
+        return app.test_client()
+
+    @pytest.fixture
+    def aircrack_calls(self, monkeypatch):
+        """Record aircrack-ng runs, reporting no handshake, and clean up the capture."""
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, stdout='0 handshake', stderr='')
+
+        monkeypatch.setattr(wifi.subprocess, 'run', fake_run)
+        path = f'/tmp/intercept_handshake_test_{os.getpid()}-01.cap'
+        with open(path, 'wb') as f:
+            f.write(b'x' * 100)
+        yield path, calls
+        os.remove(path)
+        wifi._handshake_cache.clear()
+
+    def test_aircrack_rerun_only_after_growth(self, client, aircrack_calls, monkeypatch):
+        """Test that during capture aircrack-ng runs again only once the file grows enough."""
+        path, calls = aircrack_calls
+        running = subprocess.Popen(['sleep', '30'])
+        monkeypatch.setattr(wifi.app_module, 'wifi_process', running)
+        payload = {'file': path, 'bssid': 'AA:BB:CC:DD:EE:01'}
+        try:
+            assert client.post('/wifi/handshake/status', json=payload).json['handshake_found'] is False
+            client.post('/wifi/handshake/status', json=payload)
+            assert len(calls) == 1
+
+            with open(path, 'ab') as f:
+                f.write(b'x' * 10)
+            client.post('/wifi/handshake/status', json=payload)
+            assert len(calls) == 1
+
+            with open(path, 'ab') as f:
+                f.write(b'x' * wifi.HANDSHAKE_RECHECK_BYTES)
+            client.post('/wifi/handshake/status', json=payload)
+            assert len(calls) == 2
+        finally:
+            running.kill()
+            running.wait()
+
+    def test_aircrack_rerun_on_any_change_after_capture(self, client, aircrack_calls, monkeypatch):
+        """Test that once capture has stopped, any size change triggers a recheck."""
+        path, calls = aircrack_calls
+        monkeypatch.setattr(wifi.app_module, 'wifi_process', None)
+        payload = {'file': path, 'bssid': 'AA:BB:CC:DD:EE:01'}
+        client.post('/wifi/handshake/status', json=payload)
+        with open(path, 'ab') as f:
+            f.write(b'x' * 10)
+        client.post('/wifi/handshake/status', json=payload)
+        assert len(calls) == 2
+        client.post('/wifi/handshake/status', json=payload)
+        assert len(calls) == 2
+
+
+class TestWifiStream:
+    """Tests for the WiFi SSE stream."""
+
+    def test_backlog_is_batched(self, monkeypatch):
+        """Test that queued events are sent as pre-encoded frames in one chunk."""
+        monkeypatch.setattr(wifi.app_module, 'wifi_queue', queue.Queue())
+        for i in range(wifi.SSE_BATCH_SIZE + 1):
+            wifi._emit({'type': 'info', 'text': str(i)})
+        app = Flask(__name__)
+        with app.test_request_context():
+            stream = wifi.stream_wifi().response
+            first = next(stream)
+            second = next(stream)
+        frames = first.split(b'\n\n')[:-1]
+        assert len(frames) == wifi.SSE_BATCH_SIZE
+        assert json.loads(frames[0][len(b'data: '):]) == {'type': 'info', 'text': '0'}
+        assert second == format_sse({'type': 'info', 'text': str(wifi.SSE_BATCH_SIZE)})
+
+    def test_overflow_is_counted(self, monkeypatch):
+        """Test that events beyond the queue bound are counted and reported."""
+        q = queue.Queue(maxsize=1)
+        monkeypatch.setattr(wifi.app_module, 'wifi_queue', q)
+        wifi._emit({'type': 'info', 'text': 'kept'})
+        wifi._emit({'type': 'info', 'text': 'lost'})
+        wifi._emit({'type': 'info', 'text': 'lost'})
+        app = Flask(__name__)
+        with app.test_request_context():
+            stream = wifi.stream_wifi().response
+            assert json.loads(next(stream)[len(b'data: '):])['text'] == 'kept'
+            assert json.loads(next(stream)[len(b'data: '):]) == {'type': 'dropped', 'count': 2}
+
+    def test_stream_follows_replaced_queue(self, monkeypatch):
+        """Test that a stream blocked on a replaced queue moves to the new one."""
+        old_queue = queue.Queue()
+        monkeypatch.setattr(wifi.app_module, 'wifi_queue', old_queue)
+        app = Flask(__name__)
+        with app.test_request_context():
+            stream = wifi.stream_wifi().response
+        frames = []
+        reader = threading.Thread(target=lambda: frames.append(next(stream)))
+        reader.start()
+        time.sleep(0.05)
+
+        monkeypatch.setattr(wifi.app_module, 'wifi_queue', queue.Queue())
+        wifi._retire_queue(old_queue)
+        wifi._emit({'type': 'status', 'text': 'started'})
+        reader.join(timeout=2)
+        assert frames == [format_sse({'type': 'status', 'text': 'started'})]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
 import threading
 import time
@@ -10,8 +12,41 @@ from typing import Any
 logger = logging.getLogger('intercept.cleanup')
 
 
+class _Entry:
+    """A stored value and the time it was last written."""
+
+    __slots__ = ('value', 'timestamp')
+
+    def __init__(self, value: Any, timestamp: float):
+        self.value = value
+        self.timestamp = timestamp
+
+
 class DataStore:
-    """Thread-safe data store with automatic cleanup of stale entries."""
+    """
+    Thread-safe data store with automatic cleanup of stale entries.
+
+    Reads rely on single dict operations being atomic under the GIL and take
+    no lock. Writes lock one of LOCK_SHARDS locks chosen by key, so writers
+    to different keys rarely contend.
+
+    Each entry has one record in a min-heap ordered by expiry time, so
+    cleanup only visits entries that are due. Touching an entry does not
+    reorder the heap; cleanup reschedules a record whose entry has been
+    refreshed since it was pushed.
+
+    Timestamps come from time.monotonic(), so wall-clock adjustments such as
+    NTP corrections cannot expire entries early.
+
+    touch() only records the time in a pending dict without locking; the
+    pending times are applied in one pass at the start of each cleanup, which
+    is the only place they are read.
+
+    all(), values() and items() copy a cached key -> value snapshot that is
+    rebuilt only after a write has marked it dirty.
+    """
+
+    LOCK_SHARDS = 16
 
     def __init__(self, max_age_seconds: float = 300.0, name: str = 'data'):
         """
@@ -21,83 +56,147 @@ class DataStore:
             max_age_seconds: Maximum age of entries before cleanup (default 5 minutes)
             name: Name for logging purposes
         """
-        self.data: dict[str, Any] = {}
-        self.timestamps: dict[str, float] = {}
+        self._entries: dict[str, _Entry] = {}
         self.max_age = max_age_seconds
         self.name = name
-        self._lock = threading.Lock()
+        self._locks = [threading.Lock() for _ in range(self.LOCK_SHARDS)]
+        self._expiry_heap: list[tuple[float, int, str, _Entry]] = []
+        self._heap_lock = threading.Lock()
+        self._seq = itertools.count()
+        self._pending_touch: dict[str, float] = {}
+        self._snapshot: dict[str, Any] = {}
+        self._snapshot_dirty = False
+        self._snapshot_lock = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        """Return the shard lock guarding a key."""
+        return self._locks[hash(key) % self.LOCK_SHARDS]
+
+    def _add_entry(self, key: str, value: Any, now: float) -> None:
+        """Store a new entry and schedule its expiry; caller holds the key's lock."""
+        entry = _Entry(value, now)
+        self._entries[key] = entry
+        self._snapshot_dirty = True
+        with self._heap_lock:
+            heapq.heappush(self._expiry_heap, (entry.timestamp + self.max_age, next(self._seq), key, entry))
+
+    def set(self, key: str, value: Any, now: float | None = None) -> None:
+        """
+        Add or update an entry.
 
-    def set(self, key: str, value: Any) -> None:
-        """Add or update an entry."""
-        with self._lock:
-            self.data[key] = value
-            self.timestamps[key] = time.time()
+        Args:
+            key: Entry key
+            value: Value to store
+            now: Optional time.monotonic() reading, so a burst of writes can
+                share one clock read
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock_for(key):
+            entry = self._entries.get(key)
+            if entry is None:
+                self._add_entry(key, value, now)
+            else:
+                entry.value = value
+                entry.timestamp = now
+                self._snapshot_dirty = True
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get an entry."""
-        with self._lock:
-            return self.data.get(key, default)
+        entry = self._entries.get(key)
+        return default if entry is None else entry.value
 
-    def update(self, key: str, updates: dict) -> None:
+    def update(self, key: str, updates: dict, now: float | None = None) -> None:
         """Update an existing entry with new values."""
-        with self._lock:
-            if key in self.data:
-                if isinstance(self.data[key], dict):
-                    self.data[key].update(updates)
-                else:
-                    self.data[key] = updates
+        if now is None:
+            now = time.monotonic()
+        with self._lock_for(key):
+            entry = self._entries.get(key)
+            if entry is None:
+                self._add_entry(key, updates, now)
+                return
+            if isinstance(entry.value, dict):
+                entry.value.update(updates)
             else:
-                self.data[key] = updates
-            self.timestamps[key] = time.time()
+                entry.value = updates
+                self._snapshot_dirty = True
+            entry.timestamp = now
 
-    def touch(self, key: str) -> None:
+    def touch(self, key: str, now: float | None = None) -> None:
         """Update timestamp for an entry without changing data."""
-        with self._lock:
-            if key in self.data:
-                self.timestamps[key] = time.time()
+        if key not in self._entries:
+            return
+        self._pending_touch[key] = time.monotonic() if now is None else now
+
+    def _flush_touches(self) -> None:
+        """Apply pending touch() times to their entries."""
+        pending = self._pending_touch
+        while pending:
+            # popitem() is atomic, so touches landing meanwhile are kept
+            try:
+                key, timestamp = pending.popitem()
+            except KeyError:
+                break
+            with self._lock_for(key):
+                entry = self._entries.get(key)
+                if entry is not None and timestamp > entry.timestamp:
+                    entry.timestamp = timestamp
 
     def delete(self, key: str) -> bool:
         """Delete an entry."""
-        with self._lock:
-            if key in self.data:
-                del self.data[key]
-                del self.timestamps[key]
-                return True
-            return False
+        with self._lock_for(key):
+            if self._entries.pop(key, None) is None:
+                return False
+            self._pending_touch.pop(key, None)
+            self._snapshot_dirty = True
+            return True
 
     def clear(self) -> None:
         """Clear all entries."""
-        with self._lock:
-            self.data.clear()
-            self.timestamps.clear()
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            self._entries.clear()
+            self._pending_touch.clear()
+            self._snapshot_dirty = True
+            with self._heap_lock:
+                self._expiry_heap.clear()
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def _current_snapshot(self) -> dict[str, Any]:
+        """Return the key -> value snapshot, rebuilding it if a write has dirtied it."""
+        if self._snapshot_dirty:
+            with self._snapshot_lock:
+                if self._snapshot_dirty:
+                    # Clear the flag before copying so a write that lands
+                    # during the copy marks the new snapshot dirty again
+                    self._snapshot_dirty = False
+                    self._snapshot = {key: entry.value for key, entry in list(self._entries.items())}
+        return self._snapshot
 
     def all(self) -> dict[str, Any]:
         """Get a copy of all data."""
-        with self._lock:
-            return dict(self.data)
+        return dict(self._current_snapshot())
 
     def keys(self) -> list[str]:
         """Get all keys."""
-        with self._lock:
-            return list(self.data.keys())
+        return list(self._entries)
 
     def values(self) -> list[Any]:
         """Get all values."""
-        with self._lock:
-            return list(self.data.values())
+        return list(self._current_snapshot().values())
 
     def items(self) -> list[tuple[str, Any]]:
         """Get all items."""
-        with self._lock:
-            return list(self.data.items())
+        return list(self._current_snapshot().items())
 
     def __len__(self) -> int:
-        with self._lock:
-            return len(self.data)
+        return len(self._entries)
 
     def __contains__(self, key: str) -> bool:
-        with self._lock:
-            return key in self.data
+        return key in self._entries
 
     def cleanup(self) -> int:
         """
@@ -106,22 +205,37 @@ class DataStore:
         Returns:
             Number of entries removed
         """
-        now = time.time()
-        expired = []
-
-        with self._lock:
-            for key, timestamp in self.timestamps.items():
-                if now - timestamp > self.max_age:
-                    expired.append(key)
+        self._flush_touches()
+        now = time.monotonic()
+        removed = 0
+
+        due = []
+        with self._heap_lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                due.append(heapq.heappop(self._expiry_heap))
+
+        refreshed = []
+        for _, _, key, entry in due:
+            with self._lock_for(key):
+                # Records for deleted or replaced entries are simply dropped
+                if self._entries.get(key) is not entry:
+                    continue
+                if now - entry.timestamp > self.max_age:
+                    del self._entries[key]
+                    self._snapshot_dirty = True
+                    removed += 1
+                else:
+                    refreshed.append((entry.timestamp + self.max_age, next(self._seq), key, entry))
 
-            for key in expired:
-                del self.data[key]
-                del self.timestamps[key]
+        if refreshed:
+            with self._heap_lock:
+                for record in refreshed:
+                    heapq.heappush(self._expiry_heap, record)
 
-        if expired:
-            logger.debug(f"{self.name}: Cleaned up {len(expired)} stale entries")
+        if removed:
+            logger.debug(f"{self.name}: Cleaned up {removed} stale entries")
 
-        return len(expired)
+        return removed
 
 
 class CleanupManager:
@@ -136,7 +250,8 @@ class CleanupManager:
         """
         self.stores: list[DataStore] = []
         self.interval = interval
-        self._timer: threading.Timer | None = None
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
         self._running = False
         self._lock = threading.Lock()
 
@@ -153,28 +268,30 @@ class CleanupManager:
                 self.stores.remove(store)
 
     def start(self) -> None:
-        """Start the cleanup timer."""
+        """Start the cleanup thread."""
         with self._lock:
             if self._running:
                 return
             self._running = True
-            self._schedule_cleanup()
+            # A fresh event per run so a thread still winding down from a
+            # previous stop() cannot be revived
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(
+                target=self._loop, args=(self._stop_event,), name='cleanup', daemon=True
+            )
+            self._thread.start()
 
     def stop(self) -> None:
-        """Stop the cleanup timer."""
+        """Stop the cleanup thread."""
         with self._lock:
             self._running = False
-            if self._timer:
-                self._timer.cancel()
-                self._timer = None
+            self._stop_event.set()
+            self._thread = None
 
-    def _schedule_cleanup(self) -> None:
-        """Schedule the next cleanup."""
-        if not self._running:
-            return
-        self._timer = threading.Timer(self.interval, self._run_cleanup)
-        self._timer.daemon = True
-        self._timer.start()
+    def _loop(self, stop_event: threading.Event) -> None:
+        """Run cleanup every interval until stop_event is set."""
+        while not stop_event.wait(self.interval):
+            self._run_cleanup()
 
     def _run_cleanup(self) -> None:
         """Run cleanup on all registered stores."""
@@ -192,8 +309,6 @@ class CleanupManager:
         if total_cleaned > 0:
             logger.info(f"Cleanup complete: removed {total_cleaned} stale entries")
 
-        self._schedule_cleanup()
-
     def cleanup_now(self) -> int:
         """Run cleanup immediately."""
         total = 0
@@ -214,28 +329,34 @@ cleanup_manager = CleanupManager(interval=60.0)
 def cleanup_dict(
     data: dict[str, Any],
     timestamps: dict[str, float],
-    max_age_seconds: float = 300.0
+    max_age_seconds: float = 300.0,
+    now: float | None = None
 ) -> list[str]:
     """
     Clean up stale entries from a dictionary.
 
+    Timestamps must be time.monotonic() readings, the same clock DataStore
+    uses. Values from time.time() are far ahead of that clock, so they would
+    never be treated as expired.
+
     Args:
         data: Dictionary to clean
-        timestamps: Dictionary of key -> last_seen timestamp
+        timestamps: Dictionary of key -> last_seen time.monotonic() reading
         max_age_seconds: Maximum age in seconds
+        now: Optional current time.monotonic() reading
 
     Returns:
         List of removed keys
     """
-    now = time.time()
+    if now is None:
+        now = time.monotonic()
+    cutoff = now - max_age_seconds
     expired = []
 
     for key, timestamp in list(timestamps.items()):
-        if now - timestamp > max_age_seconds:
+        if timestamp < cutoff:
+            data.pop(key, None)
+            timestamps.pop(key, None)
             expired.append(key)
 
-    for key in expired:
-        data.pop(key, None)
-        timestamps.pop(key, None)
-
     return expired
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 import shutil
 from typing import Any
@@ -7,8 +8,13 @@ from typing import Any
 logger = logging.getLogger('intercept.dependencies')
 
 
+@functools.lru_cache(maxsize=64)
 def check_tool(name: str) -> bool:
-    """Check if a tool is installed."""
+    """Check if a tool is installed.
+
+    Results are cached; check_all_dependencies() clears the cache so a
+    dependency check always reflects the current PATH.
+    """
     return shutil.which(name) is not None
 
 
@@ -206,6 +212,7 @@ TOOL_DEPENDENCIES = {
 
 def check_all_dependencies() -> dict[str, dict[str, Any]]:
     """Check all tool dependencies and return status."""
+    check_tool.cache_clear()
     results: dict[str, dict[str, Any]] = {}
 
     for mode, config in TOOL_DEPENDENCIES.items():
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import atexit
 import logging
+import os
 import signal
 import subprocess
 import re
-import threading
 import time
 from typing import Any, Callable
 
@@ -13,38 +13,62 @@ from .dependencies import check_tool
 
 logger = logging.getLogger('intercept.process')
 
-# Track all spawned processes for cleanup
+# Track all spawned processes for cleanup. list.append/remove and slicing
+# are atomic under the GIL, so the list needs no lock.
 _spawned_processes: list[subprocess.Popen] = []
-_process_lock = threading.Lock()
+
+# Tools left running by a previous run, matched against /proc/<pid>/comm.
+# Note: dump1090 is NOT included here as users may run it as a system service
+_STALE_PROCESS_NAMES = frozenset({'rtl_adsb', 'rtl_433', 'multimon-ng', 'rtl_fm'})
+
+# Colon-separated MAC address, e.g. AA:BB:CC:DD:EE:FF
+_MAC_RE = re.compile(r'(?:[0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}')
+
+# rtl_test device lines, e.g. "  0:  Realtek, RTL2838UHIDIR, SN: 00000001"
+_DEVICE_RE = re.compile(r'^[ \t]*(\d+):[ \t]+(.+?)(?:,[ \t]*SN:[ \t]*(\S+))?[ \t\r]*$', re.MULTILINE)
+_FOUND_RE = re.compile(r'Found (\d+) device')
 
 
 def register_process(process: subprocess.Popen) -> None:
     """Register a spawned process for cleanup on exit."""
-    with _process_lock:
-        _spawned_processes.append(process)
+    _spawned_processes.append(process)
 
 
 def unregister_process(process: subprocess.Popen) -> None:
     """Unregister a process from cleanup list."""
-    with _process_lock:
-        if process in _spawned_processes:
-            _spawned_processes.remove(process)
+    try:
+        _spawned_processes.remove(process)
+    except ValueError:
+        pass
 
 
 def cleanup_all_processes() -> None:
     """Clean up all registered processes on exit."""
     logger.info("Cleaning up all spawned processes...")
-    with _process_lock:
-        for process in _spawned_processes:
-            if process and process.poll() is None:
-                try:
-                    process.terminate()
-                    process.wait(timeout=2)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                except Exception as e:
-                    logger.warning(f"Error cleaning up process: {e}")
-        _spawned_processes.clear()
+    processes = _spawned_processes[:]
+
+    # Signal every process first, then share one grace period between them
+    terminating = []
+    for process in processes:
+        if process and process.poll() is None:
+            try:
+                process.terminate()
+                terminating.append(process)
+            except Exception as e:
+                logger.warning(f"Error cleaning up process: {e}")
+
+    deadline = time.monotonic() + 2
+    for process in terminating:
+        try:
+            process.wait(timeout=max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+        except Exception as e:
+            logger.warning(f"Error cleaning up process: {e}")
+
+    # Only drop what was cleaned up; anything registered meanwhile stays
+    for process in processes:
+        unregister_process(process)
 
 
 def safe_terminate(process: subprocess.Popen | None, timeout: float = 2.0) -> bool:
@@ -106,24 +130,59 @@ except ValueError:
 
 def cleanup_stale_processes() -> None:
     """Kill any stale processes from previous runs (but not system services)."""
-    # Note: dump1090 is NOT included here as users may run it as a system service
-    processes_to_kill = ['rtl_adsb', 'rtl_433', 'multimon-ng', 'rtl_fm']
-    for proc_name in processes_to_kill:
+    try:
+        proc_entries = os.scandir('/proc')
+    except OSError:
+        # No procfs (e.g. macOS)
+        _pkill_stale_processes()
+        return
+
+    with proc_entries:
+        for entry in proc_entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry.name}/comm') as f:
+                    comm = f.read().rstrip('\n')
+            except OSError:
+                continue
+            if comm in _STALE_PROCESS_NAMES:
+                try:
+                    os.kill(int(entry.name), signal.SIGKILL)
+                except (ProcessLookupError, PermissionError):
+                    pass
+
+
+def _pkill_stale_processes() -> None:
+    """Kill stale processes with pkill where /proc is not available."""
+    pkills = []
+    for proc_name in _STALE_PROCESS_NAMES:
         try:
-            subprocess.run(['pkill', '-9', proc_name], capture_output=True)
+            pkills.append(subprocess.Popen(
+                ['pkill', '-9', proc_name],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            ))
+        except (subprocess.SubprocessError, OSError):
+            pass
+    for pkill in pkills:
+        try:
+            pkill.wait()
         except (subprocess.SubprocessError, OSError):
             pass
 
 
 def is_valid_mac(mac: str | None) -> bool:
     """Validate MAC address format."""
-    if not mac:
+    if not mac or len(mac) != 17:
         return False
-    return bool(re.match(r'^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$', mac))
+    return _MAC_RE.fullmatch(mac) is not None
 
 
 def is_valid_channel(channel: str | int | None) -> bool:
     """Validate WiFi channel number."""
+    if type(channel) is int:
+        return 1 <= channel <= 200
     try:
         ch = int(channel)  # type: ignore[arg-type]
         return 1 <= ch <= 200
@@ -147,21 +206,17 @@ def detect_devices() -> list[dict[str, Any]]:
         )
         output = result.stderr + result.stdout
 
-        # Parse device info
-        device_pattern = r'(\d+):\s+(.+?)(?:,\s*SN:\s*(\S+))?$'
-
-        for line in output.split('\n'):
-            line = line.strip()
-            match = re.match(device_pattern, line)
-            if match:
-                devices.append({
-                    'index': int(match.group(1)),
-                    'name': match.group(2).strip().rstrip(','),
-                    'serial': match.group(3) or 'N/A'
-                })
+        devices = [
+            {
+                'index': int(match.group(1)),
+                'name': match.group(2).strip().rstrip(','),
+                'serial': match.group(3) or 'N/A'
+            }
+            for match in _DEVICE_RE.finditer(output)
+        ]
 
         if not devices:
-            found_match = re.search(r'Found (\d+) device', output)
+            found_match = _FOUND_RE.search(output)
             if found_match:
                 count = int(found_match.group(1))
                 for i in range(count):
@@ -7,45 +7,54 @@ import queue
 import time
 from typing import Any, Generator
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def sse_stream(
     data_queue: queue.Queue,
     timeout: float = 1.0,
     keepalive_interval: float = 30.0,
     stop_check: callable = None
-) -> Generator[str, None, None]:
+) -> Generator[bytes, None, None]:
     """
     Generate SSE stream from a queue.
 
     Args:
         data_queue: Queue to read messages from
-        timeout: Queue get timeout in seconds
+        timeout: Seconds between stop_check polls while idle
         keepalive_interval: Seconds between keepalive messages
         stop_check: Optional callable that returns True to stop the stream
 
     Yields:
-        SSE formatted strings
+        SSE formatted messages as bytes
     """
-    last_keepalive = time.time()
+    next_keepalive = time.monotonic() + keepalive_interval
 
     while True:
         # Check if we should stop
         if stop_check and stop_check():
             break
 
+        # Sleep until a message arrives or the next keepalive is due; only
+        # wake up early when there is a stop condition to poll
+        wait = next_keepalive - time.monotonic()
+        if stop_check:
+            wait = min(wait, timeout)
         try:
-            msg = data_queue.get(timeout=timeout)
-            last_keepalive = time.time()
-            yield format_sse(msg)
+            msg = data_queue.get(timeout=max(wait, 0))
         except queue.Empty:
-            # Send keepalive if enough time has passed
-            now = time.time()
-            if now - last_keepalive >= keepalive_interval:
-                yield format_sse({'type': 'keepalive'})
-                last_keepalive = now
+            if time.monotonic() >= next_keepalive:
+                yield SSE_KEEPALIVE
+                next_keepalive = time.monotonic() + keepalive_interval
+            continue
+        next_keepalive = time.monotonic() + keepalive_interval
+        yield format_sse(msg)
 
 
-def format_sse(data: dict[str, Any] | str, event: str | None = None) -> str:
+def format_sse(data: dict[str, Any] | str, event: str | None = None) -> bytes:
     """
     Format data as SSE message.
 
@@ -54,19 +63,46 @@ def format_sse(data: dict[str, Any] | str, event: str | None = None) -> str:
         event: Optional event name
 
     Returns:
-        SSE formatted string
+        SSE formatted bytes
     """
-    if isinstance(data, dict):
-        data = json.dumps(data)
+    if event is None and isinstance(data, dict):
+        return format_sse_dict(data)
 
-    lines = []
+    payload = _dumps(data) if isinstance(data, dict) else data.encode()
     if event:
-        lines.append(f"event: {event}")
-    lines.append(f"data: {data}")
-    lines.append("")
-    lines.append("")
+        return b''.join((b'event: ', event.encode(), b'\ndata: ', payload, b'\n\n'))
+    return b'data: ' + payload + b'\n\n'
+
+
+def format_sse_dict(data: dict[str, Any]) -> bytes:
+    """
+    Format a dict as an unnamed SSE message.
+
+    This is the common case of format_sse without its type and event checks,
+    for producers that always send plain JSON events.
+
+    Args:
+        data: Data to send
+
+    Returns:
+        SSE formatted bytes
+    """
+    return b'data: ' + _dumps(data) + b'\n\n'
+
+
+def _dumps(data: dict[str, Any]) -> bytes:
+    """Encode an SSE payload as JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers wider than 64 bits; let the stdlib handle them
+            pass
+    return json.dumps(data).encode()
+
 
-    return '\n'.join(lines)
+# Keepalive frames are identical every time, so build the message once
+SSE_KEEPALIVE = format_sse_dict({'type': 'keepalive'})
 
 
 def clear_queue(q: queue.Queue) -> int:
@@ -79,11 +115,15 @@ def clear_queue(q: queue.Queue) -> int:
     Returns:
         Number of items cleared
     """
-    count = 0
-    while True:
-        try:
-            q.get_nowait()
-            count += 1
-        except queue.Empty:
-            break
+    # Empty the underlying deque under the queue's own lock in one step
+    # rather than taking the lock once per item
+    with q.mutex:
+        count = q._qsize()
+        q.queue.clear()
+        if count:
+            # The items will never be processed, so settle them for join()
+            q.unfinished_tasks = max(q.unfinished_tasks - count, 0)
+            if not q.unfinished_tasks:
+                q.all_tasks_done.notify_all()
+            q.not_full.notify_all()
     return count